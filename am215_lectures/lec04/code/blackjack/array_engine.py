@@ -0,0 +1,207 @@
+import time
+import random
+
+import numpy as np
+
+from .deck import Card, Deck
+from .game import BlackjackGame, JokerBlackjackGame
+from .simulation import (
+    INITIAL_WEALTH,
+    blind_player_strategy,
+    informed_player_strategy,
+    dealer_strategy,
+    play_round as play_round_objects,
+)
+
+# --- Card Encoding ---
+# A card is a small integer: code = suit * 13 + rank index, so 0..51 for a
+# standard deck, and 52 for the Joker. Everything about a card is looked up
+# from tables indexed by its code.
+
+N_RANKS = len(Deck.RANKS)
+JOKER = 4 * N_RANKS
+RANK_VALUES = np.array([2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11], dtype=np.int8)
+
+VALUE_TABLE = np.append(np.tile(RANK_VALUES, 4), 0).astype(np.int8)
+ACE_TABLE = (VALUE_TABLE == 11).astype(np.int8)
+
+# Python tuples of the same tables: indexing them with Python ints is much
+# faster than indexing NumPy arrays one element at a time.
+_VALUES = tuple(VALUE_TABLE.tolist())
+_ACES = tuple(ACE_TABLE.tolist())
+
+# One shared Card per code, created once, for strategies that look at card ranks.
+CARDS = tuple(Card(r, s) for s in Deck.SUITS for r in Deck.RANKS) + (Card("Joker", "🃏"),)
+
+
+class Shoe:
+    """
+    A reusable, array-backed source of shuffled decks.
+
+    The cards live in an int8 array. Shuffled copies are generated `batch` at a
+    time with `Generator.permuted`, and `shuffle()` just moves on to the next
+    one, so a round starts from a full, freshly shuffled deck (as in
+    `run_simulation`) without constructing any objects.
+    """
+
+    def __init__(self, n_decks=1, joker=False, rng=None, batch=1024):
+        codes = np.tile(np.arange(4 * N_RANKS, dtype=np.int8), n_decks)
+        if joker:
+            codes = np.append(codes, np.int8(JOKER))
+        self._codes = codes
+        self._rng = np.random.default_rng(rng)
+        self._batch = batch
+        self._shuffled = np.empty((0, len(codes)), dtype=np.int8)
+        self._next = 0
+        self._cards = codes.tolist()
+
+    @classmethod
+    def create_shoe_with_joker(cls, **kwargs):
+        """A shoe whose decks have a Joker, like `Deck.create_deck_with_joker`."""
+        return cls(joker=True, **kwargs)
+
+    def __len__(self):
+        """Cards left in the current deck."""
+        return len(self._cards)
+
+    def __getitem__(self, position):
+        """The current deck's remaining cards, as Card objects."""
+        if isinstance(position, slice):
+            return [CARDS[c] for c in self._cards[position]]
+        return CARDS[self._cards[position]]
+
+    def shuffle(self):
+        """Starts a new, fully shuffled deck."""
+        if self._next == len(self._shuffled):
+            self._shuffled = self._rng.permuted(
+                np.broadcast_to(self._codes, (self._batch, len(self._codes))), axis=1
+            )
+            self._next = 0
+        self._cards = self._shuffled[self._next].tolist()
+        self._next += 1
+
+    def draw(self):
+        """Removes and returns the top card's code."""
+        return self._cards.pop()
+
+
+class ArrayBlackjackGame(BlackjackGame):
+    """Standard Blackjack rules for hands of card codes."""
+
+    @staticmethod
+    def get_hand_value(hand):
+        """Calculates the Blackjack value of a hand of card codes."""
+        value = 0
+        num_aces = 0
+        for code in hand:
+            value += _VALUES[code]
+            num_aces += _ACES[code]
+
+        # Demote aces from 11 to 1 if the total value is over 21
+        while value > 21 and num_aces:
+            value -= 10
+            num_aces -= 1
+        return value
+
+
+class ArrayJokerBlackjackGame(ArrayBlackjackGame):
+    """The Joker variant (any hand with a Joker is worth 21) for hands of card codes."""
+
+    @staticmethod
+    def get_hand_value(hand):
+        if JOKER in hand:
+            return 21
+        return ArrayBlackjackGame.get_hand_value(hand)
+
+
+def play_round(shoe, game_rules, player_strategy_fn):
+    """
+    Plays a single round from the shoe and returns the outcome.
+
+    Same rules and callbacks as `simulation.play_round`: strategies get the
+    hand (here a list of codes, valued by `game_rules.get_hand_value`) and the
+    dealer's up-card as a `Card`.
+    """
+    # --- Initial Deal ---
+    player_hand = [shoe.draw(), shoe.draw()]
+    dealer_hand = [shoe.draw(), shoe.draw()]
+    dealer_up_card = CARDS[dealer_hand[0]]
+
+    # --- Player's Turn ---
+    while player_strategy_fn(player_hand, dealer_up_card, game_rules):
+        player_hand.append(shoe.draw())
+        if game_rules.get_hand_value(player_hand) > 21:
+            return -1  # Player busts
+
+    # --- Dealer's Turn ---
+    while dealer_strategy(dealer_hand, game_rules):
+        dealer_hand.append(shoe.draw())
+        if game_rules.get_hand_value(dealer_hand) > 21:
+            return 1  # Dealer busts
+
+    # --- Determine Winner ---
+    player_value = game_rules.get_hand_value(player_hand)
+    dealer_value = game_rules.get_hand_value(dealer_hand)
+
+    if player_value > dealer_value:
+        return 1  # Player wins
+    elif player_value < dealer_value:
+        return -1  # Dealer wins
+    else:
+        return 0  # Push (tie)
+
+
+def run_simulation(n_rounds, shoe, game_rules, player_strategy_fn):
+    """Same as `simulation.run_simulation`, but every round is dealt from one reused shoe."""
+    wealth = INITIAL_WEALTH
+    wealth_history = [wealth]
+
+    for _ in range(n_rounds):
+        shoe.shuffle()
+        outcome = play_round(shoe, game_rules, player_strategy_fn)
+        wealth += outcome
+        wealth_history.append(wealth)
+        if wealth <= 0:
+            break
+
+    return wealth_history
+
+
+def benchmark(n_rounds=50_000, seed=0):
+    """Rounds/sec and mean outcome per round: Card/Deck objects vs. the array engine."""
+    scenarios = {
+        "Standard Game, Blind Strategy": (False, blind_player_strategy),
+        "Joker Game, Blind Strategy": (True, blind_player_strategy),
+        "Standard Game, Informed Strategy": (False, informed_player_strategy),
+        "Joker Game, Informed Strategy": (True, informed_player_strategy),
+    }
+    random.seed(seed)
+
+    for name, (joker, strategy) in scenarios.items():
+        deck_factory = Deck.create_deck_with_joker if joker else Deck
+        object_rules = JokerBlackjackGame if joker else BlackjackGame
+        t0 = time.perf_counter()
+        total_objects = 0
+        for _ in range(n_rounds):
+            deck = deck_factory()
+            deck.shuffle()
+            total_objects += play_round_objects(deck, object_rules, strategy)
+        t_objects = time.perf_counter() - t0
+
+        shoe = Shoe(joker=joker, rng=seed)
+        array_rules = ArrayJokerBlackjackGame if joker else ArrayBlackjackGame
+        t0 = time.perf_counter()
+        total_array = 0
+        for _ in range(n_rounds):
+            shoe.shuffle()
+            total_array += play_round(shoe, array_rules, strategy)
+        t_array = time.perf_counter() - t0
+
+        print(f"{name}:")
+        print(f"  objects: {n_rounds / t_objects:9,.0f} rounds/s, mean outcome {total_objects / n_rounds:+.4f}")
+        print(f"  array:   {n_rounds / t_array:9,.0f} rounds/s, mean outcome {total_array / n_rounds:+.4f}"
+              f"  ({t_objects / t_array:.1f}x)")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,111 @@
+import math
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from hypersphere_volume import true_volume, inside_ball
+
+CHUNK = 2**20  # points per task; each task has its own seed, so results do not depend on the worker count
+
+
+def count_hits(dimension, num_points, seed, block=2**16):
+    """Number of uniform points in [-1, 1]^d that land inside the unit ball."""
+    rng = np.random.default_rng(seed)
+    hits = 0
+    for start in range(0, num_points, block):
+        points = rng.uniform(-1, 1, size=(min(block, num_points - start), dimension))
+        hits += int(np.count_nonzero(inside_ball(points)))
+    return hits
+
+
+def _count_job(args):
+    return count_hits(*args)
+
+
+def relative_error(hits, num_points):
+    """Binomial standard error of 2^d * hits / n, relative to the estimate: sqrt((1 - p) / hits)."""
+    if hits == 0:
+        return math.inf
+    return math.sqrt((1 - hits / num_points) / hits)
+
+
+def estimate_volume_adaptive(dimension, target_rel_error=1e-3, seed=None, workers=1,
+                             initial_points=2**16, growth=2, max_points=None, verbose=False):
+    """Sample in growing rounds until the relative standard error reaches target_rel_error.
+
+    Each round is `growth` times larger than the last, but never larger than the
+    number of points still predicted to be needed from the current hit fraction
+    (n = (1 - p) / (p * target^2)), so the run does not overshoot by much.
+    Rounds are split into CHUNK-sized tasks and spread over `workers` processes.
+
+    Returns a dict with the estimate, its relative standard error, the points and
+    hits used, the number of rounds, the wall time, and whether the target was met.
+    """
+    t0 = time.perf_counter()
+    seeds = np.random.SeedSequence(seed)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    hits = num_points = rounds = 0
+    batch = initial_points
+
+    try:
+        while relative_error(hits, num_points) > target_rel_error:
+            if max_points is not None and num_points >= max_points:
+                break
+            if hits > 0:
+                p = hits / num_points
+                needed = (1 - p) / (p * target_rel_error**2) - num_points
+                batch = min(batch, max(int(needed * 1.05), initial_points))
+            if max_points is not None:
+                batch = min(batch, max_points - num_points)
+
+            sizes = [CHUNK] * (batch // CHUNK) + ([batch % CHUNK] if batch % CHUNK else [])
+            jobs = [(dimension, n, s) for n, s in zip(sizes, seeds.spawn(len(sizes)))]
+            if executor is not None and len(jobs) > 1:
+                hits += sum(executor.map(_count_job, jobs))
+            else:
+                hits += sum(map(_count_job, jobs))
+            num_points += batch
+            rounds += 1
+            if verbose:
+                print(f"  round {rounds}: {num_points:,} points, relative error "
+                      f"{relative_error(hits, num_points):.2e}")
+            batch *= growth
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    rel_error = relative_error(hits, num_points)
+    return {
+        "estimate": (2**dimension) * hits / num_points if num_points else math.nan,
+        "rel_error": rel_error,
+        "num_points": num_points,
+        "hits": hits,
+        "rounds": rounds,
+        "seconds": time.perf_counter() - t0,
+        "converged": rel_error <= target_rel_error,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Estimate the volume of the unit ball to a target relative standard error."
+    )
+    parser.add_argument("dimension", type=int)
+    parser.add_argument("rel_error", type=float, help="target relative standard error, e.g. 0.001 for 0.1%%")
+    parser.add_argument("--workers", type=int, default=1, help="processes to spread each round over")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-points", type=int, default=None, help="give up after this many points")
+    parser.add_argument("--verbose", action="store_true", help="print progress after every round")
+    args = parser.parse_args()
+
+    result = estimate_volume_adaptive(args.dimension, args.rel_error, args.seed, args.workers,
+                                      max_points=args.max_points, verbose=args.verbose)
+    volume = true_volume(args.dimension)
+    print(f"Estimate:       {result['estimate']:.6g} (true {volume:.6g}, "
+          f"actual error {abs(result['estimate'] / volume - 1):.2e})")
+    print(f"Relative error: {result['rel_error']:.2e} (target {args.rel_error:.2e})"
+          + ("" if result["converged"] else "  -- NOT reached, hit --max-points"))
+    print(f"Points used:    {result['num_points']:,} in {result['rounds']} rounds ({result['hits']:,} hits)")
+    print(f"Time:           {result['seconds']:.2f} s "
+          f"({result['num_points'] / result['seconds'] / 1e6:.1f} M points/s)")
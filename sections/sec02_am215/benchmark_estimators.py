@@ -0,0 +1,97 @@
+import sys
+import time
+import argparse
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from hypersphere_volume import (estimate_volume_vectorized, estimate_volume_sobol,
+                                estimate_volume_importance, true_volume)
+
+ESTIMATORS = {
+    "cube": estimate_volume_vectorized,
+    "sobol": estimate_volume_sobol,
+    "importance": estimate_volume_importance,
+}
+
+
+def benchmark(dimensions, max_points, repeats, seed=0):
+    """RMS relative error at each check point, and wall time per run, for every estimator and dimension.
+
+    Returns {(name, dimension): (num_points, rel_rmse, seconds_per_run)}.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(repeats)
+    results = {}
+    for dimension in dimensions:
+        V = true_volume(dimension)
+        for name, estimate in ESTIMATORS.items():
+            estimate(dimension, 16, seed)  # warm-up, so imports are not timed
+            t0 = time.perf_counter()
+            runs = [estimate(dimension, max_points, s) for s in seeds]
+            seconds = (time.perf_counter() - t0) / repeats
+            num_points = np.array([n for n, _ in runs[0]])
+            estimates = np.array([[v for _, v in run] for run in runs])
+            rel_rmse = np.sqrt(np.mean((estimates / V - 1)**2, axis=0))
+            results[name, dimension] = (num_points, rel_rmse, seconds)
+    return results
+
+
+def print_table(results, dimensions):
+    """Final relative RMSE and time per run for every estimator and dimension."""
+    print(f"{'d':>3} " + " ".join(f"{name + ' err':>16} {'time (s)':>9}" for name in ESTIMATORS))
+    for dimension in dimensions:
+        cells = []
+        for name in ESTIMATORS:
+            num_points, rel_rmse, seconds = results[name, dimension]
+            cells.append(f"{rel_rmse[-1]:>16.2e} {seconds:>9.3f}")
+        print(f"{dimension:>3} " + " ".join(cells))
+
+
+def plot(results, dimensions, filename="estimator_benchmark.png"):
+    """Relative RMSE vs. N (left) and vs. wall time (right), one line per estimator and dimension."""
+    fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+    styles = {"cube": "-", "sobol": "--", "importance": ":"}
+    colors = plt.cm.viridis(np.linspace(0, 1, len(dimensions)))
+
+    for color, dimension in zip(colors, dimensions):
+        for name in ESTIMATORS:
+            num_points, rel_rmse, seconds = results[name, dimension]
+            label = f"{name}, d={dimension}"
+            axes[0].loglog(num_points, rel_rmse, styles[name], color=color, label=label)
+            # assume time is proportional to N within a run
+            axes[1].loglog(seconds * num_points / num_points[-1], rel_rmse, styles[name], color=color)
+
+    n = np.array([10, results["cube", dimensions[0]][0][-1]])
+    axes[0].loglog(n, 1 / np.sqrt(n), 'k', lw=0.8, label=r'$1/\sqrt{N}$')
+    axes[0].set_xlabel("Number of points")
+    axes[0].set_ylabel("Relative RMS error")
+    axes[0].set_title("Error vs. number of points")
+    axes[0].legend(fontsize=6, ncol=3)
+    axes[1].set_xlabel("Wall time (s)")
+    axes[1].set_ylabel("Relative RMS error")
+    axes[1].set_title("Error vs. wall time")
+    fig.tight_layout()
+    fig.savefig(filename)
+    plt.close(fig)
+    print(f"Saved {filename}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare cube Monte Carlo, Sobol QMC and radial importance sampling."
+    )
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[2, 5, 10, 15, 20])
+    parser.add_argument("--max-points", type=int, default=2**18,
+                        help="points per run (rounded down to a power of two for Sobol)")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="estimator_benchmark.png")
+    args = parser.parse_args()
+
+    if args.max_points < 16:
+        sys.exit("--max-points must be at least 16")
+    results = benchmark(args.dimensions, args.max_points, args.repeats, args.seed)
+    print_table(results, args.dimensions)
+    plot(results, args.dimensions, args.output)
@@ -3,6 +3,14 @@ import random
 import math
 import numpy as np
 
+def true_volume(dimension):
+    """Exact volume of the unit ball in `dimension` dimensions."""
+    return math.pi**(dimension/2) / math.gamma(dimension/2 + 1)
+
+def inside_ball(points):
+    """Boolean mask of the rows of an (n, dimension) array that lie in the unit ball."""
+    return np.einsum('ij,ij->i', points, points) <= 1
+
 def estimate_volume(dimension, max_points):
     inside = 0
     check_points = np.logspace(1, np.log10(max_points), num=20, dtype=int)
@@ -19,16 +27,100 @@ def estimate_volume(dimension, max_points):
     
     return list(zip(check_points, estimates))
 
+def estimate_volume_vectorized(dimension, max_points, seed=None, chunk_size=2**18):
+    """Same check points and estimates as estimate_volume, computed with NumPy.
+
+    Points are drawn in (chunk, dimension) blocks from a seeded Generator, and
+    the estimates at the check points come from a running cumsum of hits.
+    """
+    rng = np.random.default_rng(seed)
+    check_points = np.logspace(1, np.log10(max_points), num=20, dtype=int)
+    estimates = np.zeros(len(check_points))
+    inside = 0
+
+    for start in range(0, max_points, chunk_size):
+        n = min(chunk_size, max_points - start)
+        points = rng.uniform(-1, 1, size=(n, dimension))
+        hits = np.cumsum(inside_ball(points))
+
+        # Check points that fall in this chunk (points start+1 .. start+n)
+        in_chunk = (check_points > start) & (check_points <= start + n)
+        estimates[in_chunk] = (2**dimension) * (inside + hits[check_points[in_chunk] - start - 1]) / check_points[in_chunk]
+        inside += int(hits[-1])
+
+    return list(zip(check_points, estimates))
+
+def estimate_volume_sobol(dimension, max_points, seed=None, chunk_size=2**18):
+    """Quasi-Monte Carlo version: scrambled Sobol points instead of random ones.
+
+    Sobol points fill the cube far more evenly than random points, so the
+    error falls faster than 1/sqrt(N) (though not quite 1/N, because the
+    inside-the-ball indicator is discontinuous). Check points are powers of
+    two, where Sobol sequences are balanced. Points are generated in
+    power-of-two chunks (at most chunk_size), so the sequence stays balanced
+    and memory stays bounded.
+    """
+    from scipy.stats import qmc
+
+    m = int(np.log2(max_points))
+    check_points = 2**np.arange(4, m + 1)
+    estimates = np.zeros(len(check_points))
+    chunk = 2**min(m, int(np.log2(chunk_size)))
+    sobol = qmc.Sobol(d=dimension, scramble=True, rng=np.random.default_rng(seed))
+    inside = 0
+
+    for start in range(0, 2**m, chunk):
+        points = 2 * sobol.random(chunk) - 1
+        hits = np.cumsum(inside_ball(points))
+
+        in_chunk = (check_points > start) & (check_points <= start + chunk)
+        estimates[in_chunk] = (2**dimension) * (inside + hits[check_points[in_chunk] - start - 1]) / check_points[in_chunk]
+        inside += int(hits[-1])
+
+    return list(zip(check_points, estimates))
+
+
+def estimate_volume_importance(dimension, max_points, seed=None, sigma=None, chunk_size=2**18):
+    """Importance-sampling version: sample radially instead of from the cube.
+
+    Points are x = sigma * z with z standard normal, i.e. a uniform direction
+    and a radius sigma * chi_d. With sigma = 1/sqrt(d) most of them land near
+    the ball instead of in the cube's corners. Each point inside the ball is
+    weighted by 1/q(x), with q the N(0, sigma^2 I) density, which has a closed
+    form, so V_d = E_q[1{|x| <= 1} / q(x)] without using the answer.
+    """
+    rng = np.random.default_rng(seed)
+    sigma = 1 / np.sqrt(dimension) if sigma is None else sigma
+    check_points = np.logspace(1, np.log10(max_points), num=20, dtype=int)
+    estimates = np.zeros(len(check_points))
+    log_norm = 0.5 * dimension * np.log(2 * np.pi * sigma**2)
+    total = 0.0
+
+    for start in range(0, max_points, chunk_size):
+        n = min(chunk_size, max_points - start)
+        x = sigma * rng.standard_normal((n, dimension))
+        r2 = np.einsum('ij,ij->i', x, x)
+        # 1/q(x) = exp(log_norm + r^2 / (2 sigma^2)), only needed inside the ball
+        weights = np.where(r2 <= 1, np.exp(log_norm + r2 / (2 * sigma**2)), 0.0)
+        sums = np.cumsum(weights)
+
+        in_chunk = (check_points > start) & (check_points <= start + n)
+        estimates[in_chunk] = (total + sums[check_points[in_chunk] - start - 1]) / check_points[in_chunk]
+        total += sums[-1]
+
+    return list(zip(check_points, estimates))
+
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python hypersphere_volume.py <dimension> <max_points>")
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python hypersphere_volume.py <dimension> <max_points> [seed]")
         sys.exit(1)
     
     dimension = int(sys.argv[1])
     max_points = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) == 4 else None
     
-    estimates = estimate_volume(dimension, max_points)
-    true_volume = math.pi**(dimension/2) / math.gamma(dimension/2 + 1)
+    estimates = estimate_volume_vectorized(dimension, max_points, seed)
+    volume = true_volume(dimension)
     
     for num_points, estimate in estimates:
-        print(f"{dimension},{num_points},{estimate},{true_volume}")
+        print(f"{dimension},{num_points},{estimate},{volume}")
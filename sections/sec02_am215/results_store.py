@@ -0,0 +1,197 @@
+import io
+import os
+import json
+import hashlib
+
+import numpy as np
+from hypersphere_volume import true_volume
+
+# Layout (under results_store/):
+#   rows.bin     every (dimension, num_points, estimate) row, as raw fixed-size
+#                records appended to the end of the file
+#   summary.npy  one record per (dimension, num_points) with the count and the
+#                running sums of (estimate - V_d) and (estimate - V_d)^2,
+#                updated on every append
+#   source.json  size, mtime and SHA-256 of the results.csv the store was last
+#                synced with
+#
+# results.csv is the source of truth. sync_with_csv() compares it with
+# source.json and imports only the new tail if the CSV just grew, or rebuilds
+# the store if it changed any other way (git checkout, merge, pull, edits).
+# A store with no source.json holds rows written with --no-csv only.
+#
+# The sums are taken about the true volume V_d rather than 0, so the variance
+# computed from them does not lose precision when the spread is tiny compared
+# to the estimate itself.
+
+STORE_DIR = "results_store"
+
+ROW_DTYPE = np.dtype([("dimension", "<i4"), ("num_points", "<i8"), ("estimate", "<f8")])
+SUMMARY_DTYPE = np.dtype([("dimension", "<i4"), ("num_points", "<i8"), ("count", "<i8"),
+                          ("sum", "<f8"), ("sumsq", "<f8")])
+
+
+def _paths(store):
+    return os.path.join(store, "rows.bin"), os.path.join(store, "summary.npy")
+
+
+def _combine(dimension, num_points, count, s, ss):
+    """Sum count/sum/sumsq over equal (dimension, num_points) keys."""
+    # Pack both into one int64 key (num_points < 2^48), much faster than np.unique(axis=0)
+    packed = (np.asarray(dimension, dtype=np.int64) << 48) | np.asarray(num_points, dtype=np.int64)
+    keys, inverse = np.unique(packed, return_inverse=True)
+    out = np.zeros(len(keys), dtype=SUMMARY_DTYPE)
+    out["dimension"], out["num_points"] = keys >> 48, keys & ((1 << 48) - 1)
+    out["count"] = np.bincount(inverse, weights=count, minlength=len(keys))
+    out["sum"] = np.bincount(inverse, weights=s, minlength=len(keys))
+    out["sumsq"] = np.bincount(inverse, weights=ss, minlength=len(keys))
+    return out
+
+
+def runs_to_rows(dimension, runs):
+    """Rows for a list of runs, each a list of (num_points, estimate) as the estimators return them."""
+    pairs = np.array([pair for run in runs for pair in run], dtype=float).reshape(-1, 2)
+    rows = np.zeros(len(pairs), dtype=ROW_DTYPE)
+    rows["dimension"] = dimension
+    rows["num_points"] = pairs[:, 0]
+    rows["estimate"] = pairs[:, 1]
+    return rows
+
+
+def append_rows(rows, store=STORE_DIR):
+    """Append raw rows and fold them into the per-(dimension, num_points) sums."""
+    rows = np.asarray(rows, dtype=ROW_DTYPE)
+    if len(rows) == 0:
+        return
+    os.makedirs(store, exist_ok=True)
+    rows_path, _ = _paths(store)
+    with open(rows_path, "ab") as f:
+        rows.tofile(f)
+    _update_summary(rows, store)
+
+
+def _update_summary(rows, store):
+    _, summary_path = _paths(store)
+    dimensions, which = np.unique(rows["dimension"], return_inverse=True)
+    dev = rows["estimate"] - np.array([true_volume(d) for d in dimensions])[which]
+    old = load_summary(store)
+    summary = _combine(np.concatenate([old["dimension"], rows["dimension"]]),
+                       np.concatenate([old["num_points"], rows["num_points"]]),
+                       np.concatenate([old["count"], np.ones(len(rows))]),
+                       np.concatenate([old["sum"], dev]),
+                       np.concatenate([old["sumsq"], dev**2]))
+    # np.save adds .npy to names without it, so the temporary name keeps the suffix
+    tmp = summary_path[:-4] + ".tmp.npy"
+    np.save(tmp, summary)
+    os.replace(tmp, summary_path)
+
+
+def load_rows(store=STORE_DIR):
+    """All raw rows, memory-mapped (nothing is read until it is used)."""
+    rows_path, _ = _paths(store)
+    if not os.path.isfile(rows_path) or os.path.getsize(rows_path) == 0:
+        return np.zeros(0, dtype=ROW_DTYPE)
+    return np.memmap(rows_path, dtype=ROW_DTYPE, mode="r")
+
+
+def load_summary(store=STORE_DIR):
+    _, summary_path = _paths(store)
+    if not os.path.isfile(summary_path):
+        return np.zeros(0, dtype=SUMMARY_DTYPE)
+    return np.load(summary_path)
+
+
+def rebuild_summary(store=STORE_DIR):
+    """Recompute summary.npy from rows.bin, e.g. after rows.bin was edited by hand."""
+    rows = load_rows(store)
+    _, summary_path = _paths(store)
+    if os.path.isfile(summary_path):
+        os.remove(summary_path)
+    # Fold rows in bounded chunks so huge stores do not need to fit in memory
+    chunk = 1_000_000
+    for start in range(0, len(rows), chunk):
+        _update_summary(np.array(rows[start:start + chunk]), store)
+
+
+def import_csv(csv_path="results.csv", store=STORE_DIR, offset=0):
+    """Load results.csv rows (dimension,num_points,estimate,true_volume; no header) from byte offset on."""
+    with open(csv_path, "rb") as f:
+        f.seek(offset)
+        text = f.read().decode()
+    if not text.strip():
+        return 0
+    data = np.loadtxt(io.StringIO(text), delimiter=",", ndmin=2)
+    rows = np.zeros(len(data), dtype=ROW_DTYPE)
+    rows["dimension"], rows["num_points"], rows["estimate"] = data[:, 0], data[:, 1], data[:, 2]
+    append_rows(rows, store)
+    return len(rows)
+
+
+def _source_path(store):
+    return os.path.join(store, "source.json")
+
+
+def _sha256(path, size):
+    """SHA-256 of the first size bytes of path."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while size > 0:
+            block = f.read(min(size, 2**20))
+            if not block:
+                break
+            h.update(block)
+            size -= len(block)
+    return h.hexdigest()
+
+
+def record_csv_source(csv_path="results.csv", store=STORE_DIR):
+    """Note that the store now holds exactly the rows of csv_path."""
+    st = os.stat(csv_path)
+    os.makedirs(store, exist_ok=True)
+    with open(_source_path(store), "w") as f:
+        json.dump({"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                   "sha256": _sha256(csv_path, st.st_size)}, f)
+
+
+def clear_store(store=STORE_DIR):
+    for path in (*_paths(store), _source_path(store)):
+        if os.path.isfile(path):
+            os.remove(path)
+
+
+def sync_with_csv(csv_path="results.csv", store=STORE_DIR):
+    """Bring the store in line with csv_path. Returns the number of rows (re)imported."""
+    source = None
+    if os.path.isfile(_source_path(store)):
+        with open(_source_path(store)) as f:
+            source = json.load(f)
+
+    if not os.path.isfile(csv_path):
+        if source is not None:   # the CSV the store mirrored is gone
+            clear_store(store)
+        return 0
+
+    st = os.stat(csv_path)
+    if source is not None and (source["size"], source["mtime_ns"]) == (st.st_size, st.st_mtime_ns):
+        return 0
+    if (source is not None and source["size"] <= st.st_size
+            and _sha256(csv_path, source["size"]) == source["sha256"]):
+        imported = import_csv(csv_path, store, offset=source["size"])   # rows were only appended
+    else:
+        clear_store(store)
+        imported = import_csv(csv_path, store)
+    record_csv_source(csv_path, store)
+    return imported
+
+
+def dimension_stats(summary, dimension):
+    """(Ns, mean, sample std, true volume) for one dimension, from the running sums."""
+    s = np.sort(summary[summary["dimension"] == dimension], order="num_points")
+    V = true_volume(dimension)
+    n = s["count"].astype(float)
+    mean_dev = s["sum"] / n
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = (s["sumsq"] - n * mean_dev**2) / (n - 1)
+    std = np.sqrt(np.clip(var, 0, None))
+    std[n < 2] = np.nan
+    return s["num_points"], V + mean_dev, std, V
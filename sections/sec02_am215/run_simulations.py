@@ -0,0 +1,86 @@
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from hypersphere_volume import estimate_volume_vectorized, true_volume
+from results_store import append_rows, record_csv_source, runs_to_rows, sync_with_csv
+
+
+def _run_one(args):
+    dimension, max_points, seed = args
+    return estimate_volume_vectorized(dimension, max_points, seed)
+
+
+def run_simulations(dimension, max_points, num_sim, seed=None, workers=1):
+    """Run num_sim independent simulations in this process (or a process pool).
+
+    Each simulation gets its own stream spawned from one SeedSequence, so the
+    results are reproducible for a given seed and independent of `workers`.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(num_sim)
+    jobs = [(dimension, max_points, s) for s in seeds]
+    if workers > 1 and num_sim > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_run_one, jobs))
+    return [_run_one(job) for job in jobs]
+
+
+def format_rows(dimension, runs):
+    """CSV rows (dimension,num_points,estimate,true_volume), as hypersphere_volume.py prints them."""
+    volume = true_volume(dimension)
+    return "".join(f"{dimension},{num_points},{estimate},{volume}\n"
+                   for run in runs for num_points, estimate in run)
+
+
+def append_results(text, output):
+    """Append all rows in a single write."""
+    with open(output, "a") as f:
+        f.write(text)
+
+
+def save_runs(dimension, runs, output, csv=True):
+    """Append runs to the binary results store (used by visualize_results.py) and, if csv, to output."""
+    sync_with_csv(output)
+    append_rows(runs_to_rows(dimension, runs))
+    if csv:
+        append_results(format_rows(dimension, runs), output)
+        record_csv_source(output)
+
+
+def interactive(output, workers, csv=True):
+    """Same prompts as volume_estimator.sh."""
+    while True:
+        dimension = int(input("Enter dimension: "))
+        max_points = int(input("Enter maximum number of points: "))
+        num_sim = int(input("Enter number of simulations: "))
+        runs = run_simulations(dimension, max_points, num_sim, workers=workers)
+        save_runs(dimension, runs, output, csv)
+        if input("Run another estimation? (y/n): ") != "y":
+            break
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run many hypersphere volume simulations in one process and append them to a CSV and the results store."
+    )
+    parser.add_argument("dimension", type=int, nargs="?")
+    parser.add_argument("max_points", type=int, nargs="?")
+    parser.add_argument("num_sim", type=int, nargs="?")
+    parser.add_argument("--seed", type=int, default=None, help="master seed for all simulations")
+    parser.add_argument("--workers", type=int, default=1, help="processes to spread simulations over")
+    parser.add_argument("--output", default="results.csv")
+    parser.add_argument("--no-csv", action="store_true",
+                        help="only update the binary results store, not the CSV")
+    args = parser.parse_args()
+
+    if args.dimension is None:
+        interactive(args.output, args.workers, not args.no_csv)
+        sys.exit(0)
+    if args.max_points is None or args.num_sim is None:
+        parser.error("give dimension, max_points and num_sim (or no arguments for interactive mode)")
+
+    runs = run_simulations(args.dimension, args.max_points, args.num_sim, args.seed, args.workers)
+    save_runs(args.dimension, runs, args.output, not args.no_csv)
+    print(f"Appended {args.num_sim} simulations ({sum(len(r) for r in runs)} rows) to "
+          f"{'the results store' if args.no_csv else args.output + ' and the results store'}")
@@ -1,22 +1,40 @@
-import pandas as pd
+import os
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use("Agg")  # no display needed, and safe in worker processes
 import matplotlib.pyplot as plt
 import numpy as np
+from results_store import STORE_DIR, load_summary, sync_with_csv, dimension_stats
+
+HASH_FILE = os.path.join(STORE_DIR, "plot_hashes.json")
+
+def group_by_dimension(summary):
+    """dimension -> (Ns, mean, std, true volume), computed once for all dimensions."""
+    return {int(d): dimension_stats(summary, d) for d in np.unique(summary['dimension'])}
+
+def content_hash(stats):
+    """Hash of the arrays a plot is drawn from."""
+    h = hashlib.sha256()
+    for a in stats:
+        h.update(np.ascontiguousarray(a, dtype=float).tobytes())
+    return h.hexdigest()
+
+def plot_filename(dimension):
+    return f'volume_estimate_{dimension}D.png'
 
-def plot_dimension(df, dimension):
-    data = df[df['dimension'] == dimension]
-    grouped = data.groupby('num_points')
-    
-    Ns = grouped['num_points'].first().values
-    mean_estimates = grouped['estimate'].mean().values
-    std_estimates = grouped['estimate'].std().values
-    true_volume = data['true_volume'].iloc[0]
+def plot_dimension(dimension, stats):
+    Ns, mean_estimates, std_estimates, true_volume = stats
 
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 8))
 
     ax1.plot(Ns, np.ones_like(Ns) * true_volume, 'r-', label='True Volume')
     ax1.plot(Ns, mean_estimates, 'ko--', label='MC Estimate')
-    ax1.fill_between(Ns, mean_estimates - std_estimates, 
-                     mean_estimates + std_estimates, 
+    ax1.fill_between(Ns, mean_estimates - std_estimates,
+                     mean_estimates + std_estimates,
                      alpha=0.3, color='gray', label='±1 Std Dev')
 
     ax1.set_xscale('log')
@@ -38,12 +56,52 @@ def plot_dimension(df, dimension):
     ax2.legend(loc='lower left')
 
     plt.tight_layout()
-    plt.savefig(f'volume_estimate_{dimension}D.png')
+    plt.savefig(plot_filename(dimension))
     plt.close()
+    return dimension
+
+def _plot_job(job):
+    return plot_dimension(*job)
+
+def render(grouped, workers=None, force=False):
+    """Plot every dimension whose data changed since its PNG was written. Returns (plotted, skipped)."""
+    hashes = {}
+    if os.path.isfile(HASH_FILE):
+        with open(HASH_FILE) as f:
+            hashes = json.load(f)
+
+    new_hashes = {str(d): content_hash(stats) for d, stats in grouped.items()}
+    jobs = [(d, stats) for d, stats in grouped.items()
+            if force or hashes.get(str(d)) != new_hashes[str(d)] or not os.path.isfile(plot_filename(d))]
+    skipped = sorted(set(grouped) - {d for d, _ in jobs})
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            plotted = list(executor.map(_plot_job, jobs))
+    else:
+        plotted = [_plot_job(job) for job in jobs]
+
+    hashes.update({str(d): new_hashes[str(d)] for d in plotted})
+    os.makedirs(STORE_DIR, exist_ok=True)
+    with open(HASH_FILE, "w") as f:
+        json.dump(hashes, f, indent=1)
+    return plotted, skipped
 
-df = pd.read_csv('results.csv', header=None, names=['dimension','num_points','estimate','true_volume'])
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plot the hypersphere results, one PNG per dimension.")
+    parser.add_argument("--workers", type=int, default=None, help="processes to plot with (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="redraw every plot, even if its data is unchanged")
+    args = parser.parse_args()
 
-for dimension in df['dimension'].unique():
-    plot_dimension(df, dimension)
+    # results.csv is the source of truth. The store is synced with it first (new rows are
+    # imported, or the store is rebuilt if the CSV changed through checkout/merge/pull).
+    # Mean/std then come from the store's per-(dimension, num_points) sums.
+    imported = sync_with_csv('results.csv')
+    if imported:
+        print(f"Imported {imported} rows from results.csv into {STORE_DIR}/")
 
-print("Visualization complete. PNG files generated for each dimension.")
+    plotted, skipped = render(group_by_dimension(load_summary()), args.workers, args.force)
+    if skipped:
+        print(f"Unchanged, not redrawn: {', '.join(f'{d}D' for d in skipped)}")
+    print(f"Visualization complete. {len(plotted)} PNG file(s) generated.")
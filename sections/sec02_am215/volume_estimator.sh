@@ -14,9 +14,8 @@ while true; do
   read -p "Enter dimension: " dimension
   read -p "Enter maximum number of points: " max_points
   read -p "Enter number of simulations: " num_sim
-  for ((i=1; i<=num_sim; i++)); do
-    $PY hypersphere_volume.py "$dimension" "$max_points" >> results.csv
-  done
+  # All simulations run in one Python process and are appended in one write
+  $PY run_simulations.py "$dimension" "$max_points" "$num_sim"
   read -p "Run another estimation? (y/n): " again
   [ "$again" = "y" ] || break
 done
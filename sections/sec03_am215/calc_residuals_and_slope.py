@@ -3,12 +3,14 @@
 # Requirements: pandas, numpy, matplotlib, seaborn, scipy
 
 import os
-import json
+import argparse
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy.stats import norm
+from score_archive import load_score_progress
+from results_store import get_store
 
 def get_finals_game_ids(season: str) -> pd.DataFrame:
     """Load Finals games for a season like '2014-15' -> uses '2015'."""
@@ -36,8 +38,9 @@ def calculate_residual_variance_with_slope(finals_games: pd.DataFrame, season: s
     """
     gsw_data, cle_data = [], []
     all_gsw_residuals, all_cle_residuals = [], []
+    teams = parse_matchups(finals_games['MATCHUP'])
 
-    for _, game in finals_games.iterrows():
+    for idx, game in finals_games.iterrows():
         game_id = game['GAME_ID']
         game_date = game['GAME_DATE']
         sp = get_game_score_progress(game_id)
@@ -45,11 +48,14 @@ def calculate_residual_variance_with_slope(finals_games: pd.DataFrame, season: s
         t = sp['CUMULATIVE_TIME']
         scores = sp['SCORE'].astype(str).str.split('-').apply(lambda x: [int(i) for i in x])
 
+        # SCORE is "visitor - home", so GSW is the second number in its home games
+        gsw_col = 1 if teams.at[idx, 'home'] == 'GSW' else 0
+
         # Only regulation time (<= 2880 sec = 48 min)
         mask = t <= 2880
         t = t[mask].to_numpy()
-        gsw = scores.apply(lambda x: x[0])[mask].to_numpy()
-        cle = scores.apply(lambda x: x[1])[mask].to_numpy()
+        gsw = scores.apply(lambda x: x[gsw_col])[mask].to_numpy()
+        cle = scores.apply(lambda x: x[1 - gsw_col])[mask].to_numpy()
 
         if t.size < 2:
             continue
@@ -86,6 +92,142 @@ def calculate_residual_variance_with_slope(finals_games: pd.DataFrame, season: s
 
     return gsw_data, cle_data, all_gsw_residuals, all_cle_residuals
 
+# ---------------- vectorized analysis (all games at once) ----------------
+
+def load_all_score_progress(game_ids) -> pd.DataFrame:
+    """
+    Stack score progressions for many games into one frame with a game_id column,
+    in the order of game_ids. Reads the consolidated Parquet archive (see score_archive.py).
+    """
+    game_ids = [int(g) for g in game_ids]
+    sp = load_score_progress(game_ids)
+    order = pd.Categorical(sp['game_id'], categories=game_ids).codes
+    return sp.iloc[np.argsort(order, kind='stable')].reset_index(drop=True)
+
+def parse_scores(sp: pd.DataFrame) -> pd.DataFrame:
+    """
+    Split every 'SCORE' string ("a - b") into integer columns score_1, score_2
+    with a single str.extract; rows that do not parse are dropped.
+    """
+    parts = sp['SCORE'].astype(str).str.extract(r'^\s*(\d+)\s*-\s*(\d+)\s*$')
+    ok = parts.notna().all(axis=1)
+    out = sp.loc[ok, ['game_id', 'CUMULATIVE_TIME']].copy()
+    out['score_1'] = parts.loc[ok, 0].astype(np.int64)
+    out['score_2'] = parts.loc[ok, 1].astype(np.int64)
+    return out
+
+def fit_lines_by_game(t: pd.Series, y: pd.DataFrame, game_id: pd.Series):
+    """
+    OLS line y ~ a + b t for every game and every column of y, from grouped sums.
+
+    Works with centered sums per game: slope = S_ty / S_tt, and the residual
+    variance (ddof=0, like np.var of the residuals) = (S_yy - slope * S_ty) / n.
+    Games with fewer than 2 points, or constant t, get NaN.
+
+    Returns:
+      fits: DataFrame indexed by game_id with columns n, <col>_slope,
+            <col>_intercept, <col>_variance for each column of y
+      resid: DataFrame of per-row residuals, aligned with y
+    """
+    t = t.astype(float)
+    y = y.astype(float)
+    g = game_id.to_numpy()
+
+    t_c = t - t.groupby(g).transform('mean')
+    y_mean = y.groupby(g).transform('mean')
+    y_c = y - y_mean
+
+    sums = pd.DataFrame({'n': t.groupby(g).size(), 'S_tt': (t_c**2).groupby(g).sum()})
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for col in y.columns:
+            S_ty = (t_c * y_c[col]).groupby(g).sum()
+            S_yy = (y_c[col]**2).groupby(g).sum()
+            slope = S_ty / sums['S_tt']
+            sums[f'{col}_slope'] = slope
+            sums[f'{col}_intercept'] = y[col].groupby(g).mean() - slope * t.groupby(g).mean()
+            sums[f'{col}_variance'] = (S_yy - slope * S_ty).clip(lower=0) / sums['n']
+
+    ok = (sums['n'] >= 2) & (sums['S_tt'] > 0)
+    fits = sums[ok].drop(columns='S_tt')
+    fits.index.name = 'game_id'
+
+    # Residuals = centered y minus slope * centered t, slope broadcast to rows
+    resid = pd.DataFrame(index=y.index)
+    for col in y.columns:
+        resid[col] = y_c[col] - pd.Series(g, index=y.index).map(fits[f'{col}_slope']) * t_c
+    return fits, resid
+
+def parse_matchups(matchup: pd.Series) -> pd.DataFrame:
+    """
+    Home and visiting team from MATCHUP strings, as in the finals_ids files:
+    "GSW vs. CLE" means GSW at home, "GSW @ CLE" means GSW away.
+    """
+    parts = matchup.str.extract(r'^\s*(\w+)\s+(vs\.|@)\s+(\w+)\s*$')
+    if parts.isna().any().any():
+        raise ValueError(f"Unrecognized MATCHUP: {matchup[parts.isna().any(axis=1)].iloc[0]!r}")
+    at_home = (parts[1] == 'vs.').to_numpy()
+    return pd.DataFrame({'home': np.where(at_home, parts[0], parts[2]),
+                         'visitor': np.where(at_home, parts[2], parts[0])}, index=matchup.index)
+
+def fit_team_games(games: pd.DataFrame):
+    """
+    Fit every team in every game of `games` (columns GAME_ID, MATCHUP) at once.
+
+    SCORE strings are "visitor - home", so each score column is assigned to a
+    team through the game's MATCHUP rather than by position.
+
+    Returns (rows in the order of `games`, then time):
+      fits:  DataFrame with columns game_id, team, slope, variance
+      resid: DataFrame with columns game_id, team, residual
+    """
+    game_ids = games['GAME_ID'].astype(int).to_numpy()
+    teams = parse_matchups(games['MATCHUP']).set_index(pd.Index(game_ids, name='game_id'))
+    sp = parse_scores(load_all_score_progress(game_ids))
+
+    # Only regulation time (<= 2880 sec = 48 min)
+    sp = sp[sp['CUMULATIVE_TIME'] <= 2880]
+    fits, resid = fit_lines_by_game(sp['CUMULATIVE_TIME'], sp[['score_1', 'score_2']], sp['game_id'])
+
+    order = pd.Series(np.arange(len(game_ids)), index=game_ids)
+    kept = sp['game_id'].isin(fits.index).to_numpy()
+    row_games = sp['game_id'].to_numpy()[kept]
+    team_fits, team_resid = [], []
+    for col, side in [('score_1', 'visitor'), ('score_2', 'home')]:
+        team_fits.append(pd.DataFrame({
+            'game_id': fits.index.to_numpy(),
+            'team': teams.loc[fits.index, side].to_numpy(),
+            'slope': fits[f'{col}_slope'].to_numpy(),
+            'variance': fits[f'{col}_variance'].to_numpy(),
+        }))
+        team_resid.append(pd.DataFrame({
+            'game_id': row_games,
+            'team': teams.loc[row_games, side].to_numpy(),
+            'residual': resid[col].to_numpy()[kept],
+        }))
+
+    fits = pd.concat(team_fits, ignore_index=True)
+    fits = fits.iloc[np.argsort(order.loc[fits['game_id']].to_numpy(), kind='stable')]
+    resid = pd.concat(team_resid, ignore_index=True)  # Already in game order per team
+    return fits.reset_index(drop=True), resid
+
+def calculate_residual_variance_vectorized(finals_games: pd.DataFrame, season: str,
+                                           team_1: str = "GSW", team_2: str = "CLE"):
+    """
+    Same outputs as calculate_residual_variance_with_slope(), but all games are
+    parsed and fitted together, with no Python loop over games. Teams are
+    matched to score columns via MATCHUP, so any pair of teams works.
+    """
+    fits, resid = fit_team_games(finals_games)
+    dates = dict(zip(finals_games['GAME_ID'].astype(int), finals_games['GAME_DATE']))
+    fits['game_date'] = fits['game_id'].map(dates)
+
+    columns = ['game_id', 'game_date', 'slope', 'variance']
+    team_1_data = fits.loc[fits['team'] == team_1, columns].to_dict('records')
+    team_2_data = fits.loc[fits['team'] == team_2, columns].to_dict('records')
+    team_1_resid = resid.loc[resid['team'] == team_1, 'residual'].tolist()
+    team_2_resid = resid.loc[resid['team'] == team_2, 'residual'].tolist()
+    return team_1_data, team_2_data, team_1_resid, team_2_resid
+
 def summarize_variances(gsw_data, cle_data, season: str):
     """Print summary stats and return means."""
     mean_gsw_slope = np.mean([g["slope"] for g in gsw_data]) if gsw_data else float('nan')
@@ -157,45 +299,29 @@ def plot_residuals_with_normal_fit(gsw_residuals, cle_residuals, mean_variance_g
     print(f"Saved plot: {out_png}")
 
 # -------- saving utilities --------
-def save_results(season: str, gsw_data, cle_data, gsw_resid, cle_resid,
-                 mean_gsw_slope, mean_gsw_var, mean_cle_slope, mean_cle_var):
-    os.makedirs("results", exist_ok=True)
-
-    # Per-game CSVs
-    pd.DataFrame(gsw_data).to_csv(f"results/{season}_gsw_games.csv", index=False)
-    pd.DataFrame(cle_data).to_csv(f"results/{season}_cle_games.csv", index=False)
-
-    # Residual arrays
-    np.save(f"results/{season}_gsw_residuals.npy", np.asarray(gsw_resid, dtype=np.float32))
-    np.save(f"results/{season}_cle_residuals.npy", np.asarray(cle_resid, dtype=np.float32))
-
-    # Summary JSON
-    summary = {
-        "season": season,
-        "mean_gsw_slope": float(mean_gsw_slope),
-        "mean_gsw_variance": float(mean_gsw_var),
-        "mean_cle_slope": float(mean_cle_slope),
-        "mean_cle_variance": float(mean_cle_var),
-        "n_games_gsw": len(gsw_data),
-        "n_games_cle": len(cle_data),
-        "n_residuals_gsw": len(gsw_resid),
-        "n_residuals_cle": len(cle_resid),
-    }
-    with open(f"results/{season}_summary.json", "w") as f:
-        json.dump(summary, f, indent=2)
-
-    print(f"Saved results to results/ for season {season}")
+def save_results(season: str, gsw_data, cle_data, gsw_resid, cle_resid):
+    """
+    Save the season's per-game fits and residuals into the shared results store
+    (results/store/, see results_store.py). The summary means are derived from
+    the per-game fits on load (ResultsStore.summary), so they are not passed in.
+    """
+    store = get_store()
+    store.save_season(season,
+                      games={"GSW": gsw_data, "CLE": cle_data},
+                      residuals={"GSW": gsw_resid, "CLE": cle_resid})
+    print(f"Saved results to {store.root}/ for season {season}")
 
 # ---------------- main ----------------
-def main():
+def main(vectorized: bool = False):
     os.makedirs("plots", exist_ok=True)
+    calculate = calculate_residual_variance_vectorized if vectorized else calculate_residual_variance_with_slope
 
     for season in ['2014-15', '2015-16']:
         finals_games = get_finals_game_ids(season)
         print(f"Loaded {len(finals_games)} games for season {season}")
 
         # Compute slopes/variances/residuals
-        gsw_data, cle_data, gsw_resid, cle_resid = calculate_residual_variance_with_slope(finals_games, season)
+        gsw_data, cle_data, gsw_resid, cle_resid = calculate(finals_games, season)
         mean_gsw_slope, mean_gsw_var, mean_cle_slope, mean_cle_var = summarize_variances(gsw_data, cle_data, season)
 
         # Plot residual histograms with normal overlays
@@ -203,8 +329,10 @@ def main():
         plot_residuals_with_normal_fit(gsw_resid, cle_resid, mean_gsw_var, mean_cle_var, out_png)
 
         # --- NEW: Save all results for later use ---
-        save_results(season, gsw_data, cle_data, gsw_resid, cle_resid,
-                     mean_gsw_slope, mean_gsw_var, mean_cle_slope, mean_cle_var)
+        save_results(season, gsw_data, cle_data, gsw_resid, cle_resid)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Per-game slopes and residual variances for the Finals.")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="use calculate_residual_variance_vectorized() instead of the per-game loop")
+    main(vectorized=parser.parse_args().vectorized)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# live_win_probability.py
+# Streaming in-game win probability from play-by-play score rows.
+# Requirements: pandas, pyarrow
+#
+# For each game we keep running least-squares sums of score vs. time for both
+# teams (optionally over a rolling window), so the slope and residual variance
+# of each team's line are updated in O(1) per event. Under the random-walk
+# model, the final home - visitor margin given the current margin M with
+# tau seconds left is Gaussian:
+#
+#     mean = M + (slope_home - slope_visitor) * tau
+#     var  = (variance_home + variance_visitor) * tau / duration
+#            + (Var[slope_home] + Var[slope_visitor]) * tau^2
+#
+# The first term is the random-walk noise (same per-second variance as
+# simulate_game.py); the second is the uncertainty of the fitted slopes, which
+# dominates early in a game. P(home wins) = Phi(mean / sqrt(var)).
+
+import math
+import time
+from collections import deque
+
+import pandas as pd
+from score_archive import load_score_progress
+
+DURATION = 2880            # regulation, seconds
+PRIOR_SLOPE = 0.035        # points/sec, about 100 points per game
+PRIOR_VARIANCE = 7.0       # typical per-game residual variance (see results store)
+PRIOR_SLOPE_SD = 0.005     # points/sec; uncertainty of the prior slope (~15 points per game)
+
+
+class _LineSums:
+    """Running sums for least squares of y on t; O(1) add/remove."""
+    __slots__ = ('n', 'st', 'sy', 'stt', 'sty', 'syy')
+
+    def __init__(self):
+        self.n = 0
+        self.st = self.sy = self.stt = self.sty = self.syy = 0.0
+
+    def add(self, t, y, sign=1):
+        self.n += sign
+        self.st += sign * t
+        self.sy += sign * y
+        self.stt += sign * t * t
+        self.sty += sign * t * y
+        self.syy += sign * y * y
+
+    def fit(self):
+        """
+        (slope, residual variance, variance of the slope estimate) of the
+        current points, or None if undetermined.
+        """
+        n = self.n
+        if n < 2:
+            return None
+        S_tt = self.stt - self.st * self.st / n
+        if S_tt <= 0:
+            return None
+        S_ty = self.sty - self.st * self.sy / n
+        S_yy = self.syy - self.sy * self.sy / n
+        slope = S_ty / S_tt
+        variance = max(S_yy - slope * S_ty, 0.0) / n
+        return slope, variance, variance / S_tt
+
+
+class _GameState:
+    __slots__ = ('home', 'visitor', 'events')
+
+    def __init__(self, window):
+        self.home = _LineSums()
+        self.visitor = _LineSums()
+        self.events = deque() if window is not None else None
+
+
+def win_probability(margin, tau, slope_diff, variance_sum, slope_variance_sum=0.0,
+                    duration=DURATION):
+    """P(final home - visitor margin > 0) given the current margin and tau seconds left."""
+    tau = max(tau, 0.0)
+    mean = margin + slope_diff * tau
+    var = variance_sum * tau / duration + slope_variance_sum * tau * tau
+    if var <= 0.0:
+        return 1.0 if mean > 0 else (0.5 if mean == 0 else 0.0)
+    return 0.5 * math.erfc(-mean / math.sqrt(2.0 * var))
+
+
+class LiveWinProbability:
+    """
+    Win probabilities for any number of concurrent games, one event at a time.
+
+    Each team's slope/variance comes from its own in-game fit once it has
+    min_events points; before that the prior values are used.
+    With window (seconds), only events from the last `window` seconds of the
+    game enter the fits (each event is added once and removed once, so updates
+    stay O(1) amortized).
+    """
+
+    def __init__(self, duration=DURATION, prior_slope=PRIOR_SLOPE, prior_variance=PRIOR_VARIANCE,
+                 prior_slope_sd=PRIOR_SLOPE_SD, min_events=10, window=None):
+        self.duration = duration
+        self.prior = (prior_slope, prior_variance, prior_slope_sd**2)
+        self.min_events = min_events
+        self.window = window
+        self.games = {}
+
+    def _params(self, sums):
+        fit = sums.fit() if sums.n >= self.min_events else None
+        return fit if fit is not None else self.prior
+
+    def update(self, game_id, t, score_visitor, score_home):
+        """Add one score event; returns P(home team wins)."""
+        state = self.games.get(game_id)
+        if state is None:
+            state = self.games[game_id] = _GameState(self.window)
+
+        state.visitor.add(t, score_visitor)
+        state.home.add(t, score_home)
+        if state.events is not None:
+            state.events.append((t, score_visitor, score_home))
+            while state.events[0][0] < t - self.window:
+                t_old, v_old, h_old = state.events.popleft()
+                state.visitor.add(t_old, v_old, sign=-1)
+                state.home.add(t_old, h_old, sign=-1)
+
+        slope_h, var_h, slope_var_h = self._params(state.home)
+        slope_v, var_v, slope_var_v = self._params(state.visitor)
+        return win_probability(score_home - score_visitor, self.duration - t, slope_h - slope_v,
+                               var_h + var_v, slope_var_h + slope_var_v, self.duration)
+
+    def finish(self, game_id):
+        """Forget a finished game."""
+        self.games.pop(game_id, None)
+
+    def stream(self, rows):
+        """
+        Consume (game_id, cumulative_time, score) rows, where score is the
+        play-by-play "visitor - home" string, and yield
+        (game_id, cumulative_time, home_margin, p_home_win) per valid row.
+        """
+        for game_id, t, score in rows:
+            visitor, sep, home = str(score).partition('-')
+            try:
+                visitor, home = int(visitor), int(home)
+            except ValueError:
+                continue
+            yield game_id, t, home - visitor, self.update(game_id, t, visitor, home)
+
+
+def interleaved_rows(sp: pd.DataFrame):
+    """Rows of many games in time order, as a live feed of concurrent games would deliver them."""
+    sp = sp.sort_values('CUMULATIVE_TIME', kind='stable')
+    return zip(sp['game_id'].to_numpy(), sp['CUMULATIVE_TIME'].to_numpy(), sp['SCORE'].to_numpy())
+
+
+def main():
+    sp = load_score_progress()
+    print(f"Loaded {sp['game_id'].nunique()} games ({len(sp)} score events)")
+
+    # One game in detail: 2016 Finals Game 7 (CLE @ GSW)
+    game_id = 41500407
+    live = LiveWinProbability()
+    game = sp[sp['game_id'] == game_id]
+    print(f"\nGame {game_id}: P(home team GSW wins) as the game unfolds")
+    checkpoints = iter([720, 1440, 2160, 2600, 2800, 2870, 2880])
+    next_check = next(checkpoints)
+    for gid, t, margin, p in live.stream(interleaved_rows(game)):
+        if next_check is not None and t >= next_check:
+            print(f"  t={t:5.0f}s  home margin {margin:+3d}  P(GSW wins)={p:.3f}")
+            next_check = next(checkpoints, None)
+
+    # Thousands of concurrent games: replicate the archive under fresh game ids
+    copies = max(1, 5000 // sp['game_id'].nunique())
+    big = pd.concat([sp.assign(game_id=sp['game_id'] * 1000 + i) for i in range(copies)],
+                    ignore_index=True)
+    live = LiveWinProbability(window=600)
+    t0 = time.perf_counter()
+    n = sum(1 for _ in live.stream(interleaved_rows(big)))
+    elapsed = time.perf_counter() - t0
+    print(f"\nStreamed {n:,} events from {big['game_id'].nunique():,} concurrent games "
+          f"in {elapsed:.2f} s ({n / elapsed:,.0f} events/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# plot_residuals_batch.py
+# Batch rendering of residual histograms with Normal overlays for every
+# (season, team) in the results store.
+# Requirements: numpy, matplotlib, scipy, pyarrow
+#
+# Compared with plot_residuals_with_normal_fit() in calc_residuals_and_slope.py:
+#   - histograms are precomputed with np.histogram (workers only receive the
+#     bin counts, not the residual arrays)
+#   - figures are drawn with the object-oriented Agg API (Figure +
+#     FigureCanvasAgg), never touching pyplot's global state, so they are safe
+#     to render in parallel
+#   - figures are farmed out to a process pool
+
+import os
+import time
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from scipy.stats import norm
+from results_store import get_store
+
+
+def histogram_panel(label, residuals, variance, bins=30):
+    """Precompute everything one panel needs: density histogram and Normal curve."""
+    residuals = np.asarray(residuals)
+    if residuals.size == 0:
+        return {"label": label, "empty": True}
+    density, edges = np.histogram(residuals, bins=bins, density=True)
+    x = np.linspace(edges[0], edges[-1], 200)
+    std = float(np.sqrt(variance)) if np.isfinite(variance) else np.nan
+    pdf = norm.pdf(x, float(residuals.mean()), std) if std > 0 else None
+    return {"label": label, "empty": False, "density": density, "edges": edges, "x": x, "pdf": pdf}
+
+
+def render_figure(job):
+    """Worker: draw one figure of histogram panels and save it. Returns the output path."""
+    out_png, panels, dpi = job["out_png"], job["panels"], job.get("dpi", 300)
+    fig = Figure(figsize=(6 * len(panels), 6))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(1, len(panels), squeeze=False)[0]
+
+    for ax, panel in zip(axes, panels):
+        label = panel["label"]
+        if panel["empty"]:
+            ax.text(0.5, 0.5, f"No {label} residuals", ha='center', va='center')
+            ax.axis('off')
+            continue
+        ax.stairs(panel["density"], panel["edges"], fill=True, alpha=0.6, label=f"{label} Residuals")
+        if panel["pdf"] is not None:
+            ax.plot(panel["x"], panel["pdf"], '-', lw=2, label=f'Normal Fit ({label})')
+        ax.set_title(f'{label} Residuals and Normal Distribution')
+        ax.set_xlabel('Residuals')
+        ax.set_ylabel('Density')
+        ax.legend()
+
+    fig.tight_layout()
+    os.makedirs(os.path.dirname(out_png) or '.', exist_ok=True)
+    fig.savefig(out_png, dpi=dpi)
+    return out_png
+
+
+def render_all(jobs, n_workers=None):
+    """Render every job, in parallel when n_workers > 1. Returns the output paths."""
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            return list(executor.map(render_figure, jobs, chunksize=max(1, len(jobs) // (4 * n_workers))))
+    return [render_figure(job) for job in jobs]
+
+
+def store_jobs(store=None, out_dir="plots", dpi=300, per_team=False):
+    """
+    Jobs for every season in the results store: one figure per season with a
+    panel per team (per_team=False, like the original plots), or one figure
+    per (season, team).
+    """
+    store = get_store() if store is None else store
+    jobs = []
+    for season in store.seasons():
+        summary = store.summary(season)
+        panels = [histogram_panel(team, store.residuals(season, team), s["variance"])
+                  for team, s in summary.items()]
+        if per_team:
+            jobs += [{"out_png": os.path.join(out_dir, f"residuals_normal_{season}_{p['label']}.png"),
+                      "panels": [p], "dpi": dpi} for p in panels]
+        else:
+            jobs.append({"out_png": os.path.join(out_dir, f"residuals_normal_{season}.png"),
+                         "panels": panels, "dpi": dpi})
+    return jobs
+
+
+def benchmark(n_figures=40, dpi=300, n_workers=None):
+    """
+    Figures/sec: seaborn + pyplot one at a time (dpi=300, as in
+    calc_residuals_and_slope.py) vs. precomputed histograms on a process pool,
+    at the same dpi=300 and also at `dpi` if that is lower.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    from calc_residuals_and_slope import plot_residuals_with_normal_fit
+
+    rng = np.random.default_rng(0)
+    data = [(rng.normal(0, 2.5, 800), rng.normal(0, 2.8, 800)) for _ in range(n_figures)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        for i, (a, b) in enumerate(data):
+            plot_residuals_with_normal_fit(a, b, 6.25, 7.84, os.path.join(tmp, f"seq_{i}.png"))
+        t_seq = time.perf_counter() - t0
+
+        rates = {}
+        for batch_dpi in sorted({300, dpi}, reverse=True):
+            t0 = time.perf_counter()
+            jobs = [{"out_png": os.path.join(tmp, f"batch_{i}.png"), "dpi": batch_dpi,
+                     "panels": [histogram_panel("GSW", a, 6.25), histogram_panel("CLE", b, 7.84)]}
+                    for i, (a, b) in enumerate(data)]
+            render_all(jobs, n_workers)
+            rates[batch_dpi] = n_figures / (time.perf_counter() - t0)
+
+    print(f"\nSequential seaborn/pyplot (dpi=300): {n_figures / t_seq:6.1f} figures/s")
+    for batch_dpi, rate in rates.items():
+        print(f"Batch Agg, process pool  (dpi={batch_dpi}): {rate:6.1f} figures/s "
+              f"({rate * t_seq / n_figures:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render residual histograms for every season in the results store.")
+    parser.add_argument("--dpi", type=int, default=300,
+                        help="resolution of the saved figures (default 300, as in calc_residuals_and_slope.py)")
+    parser.add_argument("--per-team", action="store_true", help="one figure per (season, team)")
+    parser.add_argument("--workers", type=int, default=None, help="processes to render with (default: all cores)")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="also compare figures/sec with the one-at-a-time seaborn version")
+    args = parser.parse_args()
+
+    jobs = store_jobs(dpi=args.dpi, per_team=args.per_team)
+    if not jobs:
+        print("Results store is empty. Run calc_residuals_and_slope.py first.")
+        return
+    t0 = time.perf_counter()
+    paths = render_all(jobs, args.workers)
+    elapsed = time.perf_counter() - t0
+    for path in paths:
+        print(f"Saved plot: {path}")
+    print(f"Rendered {len(paths)} figures in {elapsed:.2f} s")
+
+    if args.benchmark:
+        benchmark(dpi=args.dpi, n_workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
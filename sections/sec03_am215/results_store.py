@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# results_store.py
+# One columnar store for the per-season results of calc_residuals_and_slope.py,
+# replacing the per-season CSV/NPY/JSON files.
+# Requirements: numpy, pandas, pyarrow
+#
+# Layout (under results/store/):
+#   games.parquet    per-game fits for every season and team
+#                    (season, team, game_id, game_date, slope, variance)
+#   residuals.arrow  Arrow IPC file, one record batch per season with columns
+#                    team, residual (float32), sorted by team; memory-mapped on
+#                    read, so residual arrays are zero-copy views of the file
+
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+STORE_DIR = 'results/store'
+
+
+class ResultsStore:
+    """Read/write access to the results store. Reads are cached until the files change."""
+
+    def __init__(self, root: str = STORE_DIR):
+        self.root = root
+        self.games_path = os.path.join(root, 'games.parquet')
+        self.residuals_path = os.path.join(root, 'residuals.arrow')
+        self._games = None        # (mtime_ns, DataFrame)
+        self._residuals = None    # (mtime_ns, MemoryMappedFile, {season: RecordBatch})
+        self._summaries = {}      # (mtime_ns, season) -> summary dict
+
+    # ---------------- writing ----------------
+
+    def save_season(self, season: str, games: dict, residuals: dict):
+        """
+        Replace one season's results.
+          games:     team -> list of {"game_id", "game_date", "slope", "variance"}
+          residuals: team -> 1D array of residuals
+        """
+        os.makedirs(self.root, exist_ok=True)
+
+        rows = [dict(g, season=season, team=team) for team, gs in games.items() for g in gs]
+        new = pd.DataFrame(rows, columns=['season', 'team', 'game_id', 'game_date', 'slope', 'variance'])
+        old = self.games()
+        table = pd.concat([old[old['season'] != season], new], ignore_index=True)
+        self._write_atomic(self.games_path, lambda p: table.to_parquet(p, index=False))
+
+        teams = sorted(residuals)
+        batch = pa.RecordBatch.from_pydict({
+            'team': pa.array(np.repeat(teams, [len(residuals[t]) for t in teams]).astype(str)),
+            'residual': pa.array(np.concatenate([np.asarray(residuals[t], dtype=np.float32)
+                                                 for t in teams]) if teams else np.empty(0, np.float32)),
+        })
+        batches = {s: b for s, b in self._season_batches().items() if s != season}
+        batches[season] = batch
+
+        def write_ipc(path):
+            schema = batch.schema.with_metadata({'seasons': ','.join(batches)})
+            with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+                for b in batches.values():
+                    writer.write_batch(b)
+            batches.clear()  # the old batches are views of the mapped file
+        self._write_atomic(self.residuals_path, write_ipc, before_replace=self._release_residuals)
+
+    @staticmethod
+    def _write_atomic(path, write, before_replace=None):
+        tmp = path + '.tmp'
+        write(tmp)
+        if before_replace is not None:
+            before_replace()
+        os.replace(tmp, path)
+
+    def _release_residuals(self):
+        """
+        Unmap residuals.arrow. Windows cannot replace a file that is mapped or
+        open, so this runs before os.replace. Arrays already returned by
+        residuals() keep the old mapping alive until they are freed.
+        """
+        if self._residuals is not None:
+            source = self._residuals[1]
+            self._residuals = None
+            source.close()
+
+    # ---------------- reading ----------------
+
+    @staticmethod
+    def _mtime(path):
+        return os.stat(path).st_mtime_ns if os.path.isfile(path) else None
+
+    def games(self, season: str = None) -> pd.DataFrame:
+        """Per-game fits (all seasons, or one)."""
+        mtime = self._mtime(self.games_path)
+        if mtime is None:
+            df = pd.DataFrame(columns=['season', 'team', 'game_id', 'game_date', 'slope', 'variance'])
+        elif self._games is not None and self._games[0] == mtime:
+            df = self._games[1]
+        else:
+            df = pd.read_parquet(self.games_path)
+            self._games = (mtime, df)
+        return df if season is None else df[df['season'] == season]
+
+    def _season_batches(self) -> dict:
+        """season -> memory-mapped record batch."""
+        mtime = self._mtime(self.residuals_path)
+        if mtime is None:
+            return {}
+        if self._residuals is None or self._residuals[0] != mtime:
+            self._release_residuals()
+            source = pa.memory_map(self.residuals_path, 'r')
+            reader = pa.ipc.open_file(source)
+            seasons = reader.schema.metadata[b'seasons'].decode().split(',')
+            self._residuals = (mtime, source, {s: reader.get_batch(i) for i, s in enumerate(seasons)})
+        return self._residuals[2]
+
+    def seasons(self) -> list:
+        return list(self._season_batches())
+
+    def residuals(self, season: str, team: str) -> np.ndarray:
+        """One team's residuals for a season: a read-only, zero-copy view of the mapped file."""
+        batches = self._season_batches()
+        if season not in batches:
+            raise KeyError(f"No residuals for season {season} in {self.residuals_path}. "
+                           "Run calc_residuals_and_slope.py first.")
+        batch = batches[season]
+        teams = batch.column('team').to_numpy(zero_copy_only=False)
+        lo, hi = np.searchsorted(teams, team, side='left'), np.searchsorted(teams, team, side='right')
+        return batch.column('residual').slice(lo, hi - lo).to_numpy(zero_copy_only=True)
+
+    def summary(self, season: str) -> dict:
+        """
+        Per-team summary for a season, cached in-process:
+          team -> {"slope", "variance", "n_games", "n_residuals"}
+        slope/variance are means over the season's games.
+        """
+        key = (self._mtime(self.games_path), season)
+        if key not in self._summaries:
+            games = self.games(season)
+            if games.empty:
+                raise FileNotFoundError(f"No results for season {season} in {self.root}. "
+                                        "Run calc_residuals_and_slope.py first.")
+            stats = games.groupby('team')[['slope', 'variance']].mean()
+            counts = games.groupby('team').size()
+            self._summaries[key] = {
+                team: {"slope": float(stats.at[team, 'slope']),
+                       "variance": float(stats.at[team, 'variance']),
+                       "n_games": int(counts[team]),
+                       "n_residuals": len(self.residuals(season, team))}
+                for team in stats.index
+            }
+        return self._summaries[key]
+
+
+_default_store = None
+
+
+def get_store(root: str = STORE_DIR) -> ResultsStore:
+    """Process-wide store instance, so every script shares one cache."""
+    global _default_store
+    if _default_store is None or _default_store.root != root:
+        _default_store = ResultsStore(root)
+    return _default_store
+
+
+def load_season_summary(season: str):
+    """Mean (GSW slope, GSW variance, CLE slope, CLE variance) for a season."""
+    s = get_store().summary(season)
+    return (s["GSW"]["slope"], s["GSW"]["variance"], s["CLE"]["slope"], s["CLE"]["variance"])
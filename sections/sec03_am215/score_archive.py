@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# score_archive.py
+# Bulk, cached loading of score_progress/score_progress_<game_id>.csv files.
+# Requirements: pandas, pyarrow
+
+import os
+import glob
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+
+SCORE_DIR = 'score_progress'
+ARCHIVE = 'results/score_progress.parquet'
+COLUMNS = ['CUMULATIVE_TIME', 'SCORE']
+
+
+def game_id_from_path(path: str) -> int:
+    """score_progress/score_progress_41400401.csv -> 41400401"""
+    return int(os.path.splitext(os.path.basename(path))[0].rsplit('_', 1)[-1])
+
+
+def list_score_files(score_dir: str = SCORE_DIR) -> dict:
+    """Map game_id -> path for every score_progress CSV in score_dir."""
+    paths = glob.glob(os.path.join(score_dir, 'score_progress_*.csv'))
+    return {game_id_from_path(p): p for p in sorted(paths)}
+
+
+# float64, not int64: some feeds record CUMULATIVE_TIME with fractional seconds
+_CONVERT = pv.ConvertOptions(include_columns=COLUMNS,
+                             column_types={'CUMULATIVE_TIME': pa.float64(), 'SCORE': pa.string()})
+_READ = pv.ReadOptions(use_threads=False)  # parallelism comes from the thread pool
+
+
+def _read_one(item) -> pa.Table:
+    """Read only the needed columns of one game's CSV, tagged with its game_id."""
+    game_id, path = item
+    table = pv.read_csv(path, read_options=_READ, convert_options=_CONVERT)
+    game_col = pa.array([game_id] * table.num_rows, type=pa.int64())
+    return table.add_column(0, 'game_id', game_col)
+
+
+def read_score_files(files: dict, n_workers: int = 16) -> pd.DataFrame:
+    """
+    Read many score_progress CSVs concurrently on a thread pool, with pyarrow's
+    CSV reader (which releases the GIL). files: game_id -> path.
+    Returns one frame with columns game_id, CUMULATIVE_TIME, SCORE (rows without a SCORE dropped).
+    """
+    if not files:
+        return pd.DataFrame({'game_id': pd.Series(dtype='int64'),
+                             'CUMULATIVE_TIME': pd.Series(dtype='float64'),
+                             'SCORE': pd.Series(dtype=object)})
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        tables = list(executor.map(_read_one, files.items()))
+    table = pa.concat_tables(tables)
+    table = table.filter(pc.is_valid(table['SCORE']))
+    return table.to_pandas()
+
+
+def archive_is_stale(files: dict, archive: str = ARCHIVE) -> bool:
+    """The archive is stale if missing, older than any CSV, or built from a different set of games."""
+    if not os.path.isfile(archive):
+        return True
+    archive_mtime = os.path.getmtime(archive)
+    if any(os.path.getmtime(p) > archive_mtime for p in files.values()):
+        return True
+    archived = pd.read_parquet(archive, columns=['game_id'])['game_id'].unique()
+    return set(archived.tolist()) != set(files)
+
+
+def consolidate(score_dir: str = SCORE_DIR, archive: str = ARCHIVE, n_workers: int = 16) -> pd.DataFrame:
+    """Read every CSV in score_dir and write them as one Parquet file sorted by game_id."""
+    files = list_score_files(score_dir)
+    df = read_score_files(files, n_workers=n_workers)
+    df = df.sort_values('game_id', kind='stable', ignore_index=True)
+
+    os.makedirs(os.path.dirname(archive) or '.', exist_ok=True)
+    tmp = archive + '.tmp'
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, archive)
+    print(f"Consolidated {len(files)} games ({len(df)} rows) into {archive}")
+    return df
+
+
+def load_score_progress(game_ids=None, score_dir: str = SCORE_DIR, archive: str = ARCHIVE,
+                        n_workers: int = 16) -> pd.DataFrame:
+    """
+    Score progressions for the requested games (all games if None), from the
+    consolidated Parquet archive. The archive is (re)built first if it is
+    missing or out of date with the CSVs in score_dir.
+    Raises FileNotFoundError if a requested game has no CSV.
+    """
+    files = list_score_files(score_dir)
+    if game_ids is not None:
+        game_ids = [int(g) for g in game_ids]
+        missing = [g for g in game_ids if g not in files]
+        if missing:
+            raise FileNotFoundError(f"Missing score_progress files for games: {missing}")
+
+    if archive_is_stale(files, archive):
+        consolidate(score_dir, archive, n_workers=n_workers)
+
+    filters = None if game_ids is None else [('game_id', 'in', game_ids)]
+    return pd.read_parquet(archive, filters=filters)
+
+
+def main():
+    files = list_score_files()
+    print(f"Found {len(files)} score_progress files in {SCORE_DIR}/")
+
+    t0 = time.perf_counter()
+    for game_id in files:
+        pd.read_csv(files[game_id]).dropna(subset=['SCORE'])
+    t1 = time.perf_counter()
+    print(f"Sequential read_csv, all columns:  {t1 - t0:.3f} s")
+
+    read_score_files(files)
+    t2 = time.perf_counter()
+    print(f"Thread pool pyarrow, 2 columns:    {t2 - t1:.3f} s")
+
+    consolidate()
+    t3 = time.perf_counter()
+    load_score_progress()
+    t4 = time.perf_counter()
+    print(f"Load from consolidated Parquet:    {t4 - t3:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,29 +2,13 @@
 # nba_finals_series_sim.py
 # Simulate ensembles of NBA Finals best-of-7 series using saved slope/variance values.
 
-import os
-import json
+import time
+import argparse
 import numpy as np
-from simulate_game import simulate_basketball_game
-
-# ----------- Load season summary results -----------
-
-def load_season_summary(season: str):
-    """Load per-season mean slopes/variances from results/{season}_summary.json."""
-    path = f"results/{season}_summary.json"
-    if not os.path.isfile(path):
-        raise FileNotFoundError(
-            f"Missing {path}. Run calc_residuals.py first to generate summaries."
-        )
-    with open(path, "r") as f:
-        s = json.load(f)
-    return (
-        float(s["mean_gsw_slope"]),
-        float(s["mean_gsw_variance"]),
-        float(s["mean_cle_slope"]),
-        float(s["mean_cle_variance"]),
-    )
-
+from scipy.special import comb
+from scipy.stats import norm
+from simulate_game import simulate_basketball_game, final_margin_distribution
+from results_store import load_season_summary
 
 # ----------- Series simulation -----------
 def simulate_7_game_series(slope_gsw, variance_gsw, slope_cle, variance_cle):
@@ -57,18 +41,194 @@ def simulate_ensemble_of_series(num_series, slope_gsw, variance_gsw, slope_cle,
             cle_wins += 1
     return gsw_wins, cle_wins
 
+# ----------- Vectorized ensemble -----------
+def series_outcomes(game_wins):
+    """
+    Winner and length of every series from a (num_series, 7) boolean matrix of
+    GSW game wins (games after the series is decided are simply ignored).
+    Returns gsw_won (num_series,) bool and length (num_series,) in 4..7.
+    """
+    gsw_count = np.cumsum(game_wins, axis=1, dtype=np.int8)
+    cle_count = np.arange(1, 8, dtype=np.int8) - gsw_count
+    decided = (gsw_count == 4) | (cle_count == 4)
+    length = decided.argmax(axis=1) + 1
+    # Over all 7 games, GSW has >= 4 wins exactly when they reach 4 first
+    gsw_won = gsw_count[:, -1] >= 4
+    return gsw_won, length
+
+
+def simulate_series_ensemble(num_series, slope_gsw, variance_gsw, slope_cle, variance_cle,
+                             rng=None, chunk_size=1_000_000):
+    """
+    Vectorized version of simulate_ensemble_of_series().
+
+    Instead of simulating full score paths, each game's final margin is drawn
+    directly from its exact Gaussian distribution, giving a (num_series, 7)
+    win matrix per chunk; series winners and lengths follow from cumulative sums.
+
+    Returns:
+      gsw_wins, cle_wins: number of series won by each team
+      length_counts: dict {4: n, 5: n, 6: n, 7: n} of series lengths
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    mean, std = final_margin_distribution(slope_gsw, variance_gsw, slope_cle, variance_cle)
+
+    gsw_wins = 0
+    lengths = np.zeros(8, dtype=np.int64)
+    for start in range(0, num_series, chunk_size):
+        n = min(chunk_size, num_series - start)
+        margins = rng.normal(mean, std, size=(n, 7))
+        gsw_won, length = series_outcomes(margins > 0)
+        gsw_wins += int(gsw_won.sum())
+        lengths += np.bincount(length, minlength=8)
+
+    length_counts = {k: int(lengths[k]) for k in range(4, 8)}
+    return gsw_wins, num_series - gsw_wins, length_counts
+
+# ----------- Exact probabilities -----------
+def margin_win_probability(mean, std):
+    """
+    P(margin > 0) for a Gaussian margin, Phi(mean / std). With std = 0 the
+    margin is exactly `mean`, so this is a step: 1 if mean > 0, else 0
+    (a tie is not a win, as in the simulations).
+    """
+    mean, std = np.asarray(mean, dtype=float), np.asarray(std, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p = norm.cdf(mean / std)
+    return np.where(std > 0, p, (mean > 0).astype(float))
+
+
+def game_win_probability(slope_gsw, variance_gsw, slope_cle, variance_cle):
+    """P(GSW wins a single game) = P(final margin > 0) under the Gaussian margin."""
+    mean, std = final_margin_distribution(slope_gsw, variance_gsw, slope_cle, variance_cle)
+    return float(margin_win_probability(mean, std))
+
+
+def series_length_probabilities(p, wins_needed=4):
+    """
+    Exact P(series ends in 4, 5, 6, 7 games, won by GSW) and (..., won by CLE)
+    for per-game GSW win probability p. Ending in wins_needed + k games means
+    the winner took the last game and wins_needed - 1 of the k + wins_needed - 1
+    before it (negative binomial).
+    Returns two dicts {length: probability}.
+    """
+    q = 1.0 - p
+    k = np.arange(wins_needed)
+    ways = comb(wins_needed - 1 + k, k)
+    gsw = ways * p**wins_needed * q**k
+    cle = ways * q**wins_needed * p**k
+    lengths = wins_needed + k
+    return (dict(zip(lengths.tolist(), gsw.tolist())),
+            dict(zip(lengths.tolist(), cle.tolist())))
+
+
+def series_win_probability(p, wins_needed=4):
+    """
+    Exact P(GSW wins the series): sum over k of C(3+k, k) p^4 (1-p)^k.
+    p may be a scalar or an array of per-game probabilities.
+    """
+    p = np.asarray(p, dtype=float)[..., None]
+    k = np.arange(wins_needed)
+    prob = np.sum(comb(wins_needed - 1 + k, k) * p**wins_needed * (1.0 - p)**k, axis=-1)
+    return float(prob) if prob.ndim == 0 else prob
+
+
+# ----------- Adaptive Monte Carlo -----------
+def simulate_until_precision(target_se, slope_gsw, variance_gsw, slope_cle, variance_cle,
+                             batch_size=100_000, max_series=10**9, rng=None):
+    """
+    Simulate series in batches until the standard error of the GSW series-win
+    fraction, sqrt(p(1-p)/n), falls below target_se (or max_series is reached).
+
+    Returns:
+      p_hat, se, num_series, length_counts
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    gsw_wins, n = 0, 0
+    length_counts = {k: 0 for k in range(4, 8)}
+    next_batch = batch_size
+    while n < max_series:
+        batch = min(next_batch, max_series - n)
+        wins, _, counts = simulate_series_ensemble(
+            batch, slope_gsw, variance_gsw, slope_cle, variance_cle, rng=rng
+        )
+        gsw_wins += wins
+        n += batch
+        for k in length_counts:
+            length_counts[k] += counts[k]
+
+        p_hat = gsw_wins / n
+        # Guard against a zero SE estimate when no (or every) series was won
+        p_guard = min(max(p_hat, 1.0 / n), 1.0 - 1.0 / n)
+        se = np.sqrt(p_guard * (1.0 - p_guard) / n)
+        if se <= target_se:
+            break
+        # Jump to (about) the number of series the current estimate needs
+        needed = int(np.ceil(p_guard * (1.0 - p_guard) / target_se**2))
+        next_batch = max(batch_size, needed - n)
+    return p_hat, se, n, length_counts
+
 # ----------- Main -----------
 
-def main():
-    num_series = 1000
-    for season in ["2014-15", "2015-16"]:
+def print_length_distribution(length_counts, num_series):
+    print("Series length: " + ", ".join(
+        f"{k} games {n/num_series:.1%}" for k, n in length_counts.items()))
+
+
+def main(method="loop", num_series=None, target_se=1e-3, seasons=("2014-15", "2015-16"), seed=None):
+    rng = np.random.default_rng(seed)
+    for season in seasons:
         mean_gsw_slope, mean_gsw_var, mean_cle_slope, mean_cle_var = load_season_summary(season)
-        gsw_wins, cle_wins = simulate_ensemble_of_series(
-            num_series, mean_gsw_slope, mean_gsw_var, mean_cle_slope, mean_cle_var
-        )
-        print(f"\n=== Simulation results for {season} Finals ===")
-        print(f"GSW won {gsw_wins} out of {num_series} series ({gsw_wins/num_series:.1%})")
-        print(f"CLE won {cle_wins} out of {num_series} series ({cle_wins/num_series:.1%})")
+        params = (mean_gsw_slope, mean_gsw_var, mean_cle_slope, mean_cle_var)
+
+        if method == "loop":
+            n = 1000 if num_series is None else num_series
+            gsw_wins, cle_wins = simulate_ensemble_of_series(n, *params)
+            print(f"\n=== Simulation results for {season} Finals ===")
+            print(f"GSW won {gsw_wins} out of {n} series ({gsw_wins/n:.1%})")
+            print(f"CLE won {cle_wins} out of {n} series ({cle_wins/n:.1%})")
+            continue
+
+        p_game = game_win_probability(*params)
+        t0 = time.perf_counter()
+
+        if method == "exact":
+            gsw_len, cle_len = series_length_probabilities(p_game)
+            p_series = sum(gsw_len.values())
+            print(f"\n=== Exact results for {season} Finals ===")
+            print(f"P(GSW wins a game) = {p_game:.4f}")
+            print(f"P(GSW wins series) = {p_series:.6f}, P(CLE wins series) = {1 - p_series:.6f}")
+            print("Series length: " + ", ".join(
+                f"{k} games {gsw_len[k] + cle_len[k]:.1%}" for k in gsw_len))
+            continue
+
+        if method == "adaptive":
+            p_hat, se, n, length_counts = simulate_until_precision(target_se, *params, rng=rng)
+            gsw_wins = int(round(p_hat * n))
+        else:
+            n = 10_000_000 if num_series is None else num_series
+            gsw_wins, _, length_counts = simulate_series_ensemble(n, *params, rng=rng)
+            p_hat = gsw_wins / n
+            se = np.sqrt(p_hat * (1 - p_hat) / n)
+        elapsed = time.perf_counter() - t0
+
+        print(f"\n=== Simulation results for {season} Finals ({elapsed:.2f} s) ===")
+        print(f"GSW won {gsw_wins} out of {n} series ({p_hat:.1%} +/- {se:.2g} SE)")
+        print(f"CLE won {n - gsw_wins} out of {n} series ({1 - p_hat:.1%})")
+        print(f"Exact P(GSW wins series) = {series_win_probability(p_game):.6f}")
+        print_length_distribution(length_counts, n)
+
 
 if __name__ == "__main__":
-    main()
+    ap = argparse.ArgumentParser(description="NBA Finals best-of-7 series win probabilities.")
+    ap.add_argument("--method", choices=["loop", "exact", "mc", "adaptive"], default="loop",
+                    help="loop: simulate_ensemble_of_series(), one game at a time; "
+                         "exact: negative binomial sum; mc: vectorized fixed-size ensemble; "
+                         "adaptive: simulate until the standard error reaches --target-se")
+    ap.add_argument("--num-series", type=int, default=None,
+                    help="ensemble size for --method loop (default 1000) or mc (default 10,000,000)")
+    ap.add_argument("--target-se", type=float, default=1e-3, help="target standard error for --method adaptive")
+    ap.add_argument("--seasons", nargs="+", default=["2014-15", "2015-16"])
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args()
+    main(args.method, args.num_series, args.target_se, args.seasons, args.seed)
@@ -1,29 +1,13 @@
 #!/usr/bin/env python3
 # nba_finals_simulate_from_saved.py
-# Uses results saved by calc_residuals.py
+# Uses results saved by calc_residuals.py (in the results store, see results_store.py)
 
 import os
-import json
+import time
+import argparse
 import numpy as np
 import matplotlib.pyplot as plt
-
-
-def load_season_summary(season: str):
-    """Load per-season mean slopes/variances from results/{season}_summary.json."""
-    path = f"results/{season}_summary.json"
-    if not os.path.isfile(path):
-        raise FileNotFoundError(
-            f"Missing {path}. Run calc_residuals.py first to generate summaries."
-        )
-    with open(path, "r") as f:
-        s = json.load(f)
-    # Expected keys: mean_gsw_slope, mean_gsw_variance, mean_cle_slope, mean_cle_variance
-    return (
-        float(s["mean_gsw_slope"]),
-        float(s["mean_gsw_variance"]),
-        float(s["mean_cle_slope"]),
-        float(s["mean_cle_variance"]),
-    )
+from results_store import load_season_summary
 
 
 def simulate_basketball_game(slope_gsw, variance_gsw, slope_cle, variance_cle,
@@ -54,6 +38,70 @@ def simulate_basketball_game(slope_gsw, variance_gsw, slope_cle, variance_cle,
     return cumulative_time, gsw_scores, cle_scores
 
 
+def final_margin_distribution(slope_gsw, variance_gsw, slope_cle, variance_cle,
+                              duration=2880, time_step=10):
+    """
+    Exact distribution of the final GSW - CLE margin under the random-walk model.
+
+    The final margin is a sum of steps-1 independent Gaussian increments, so it
+    is Gaussian itself. Returns (mean, std).
+    """
+    steps = int(duration / time_step)
+    mean = (slope_gsw - slope_cle) * time_step * (steps - 1)
+    std = np.sqrt((variance_gsw + variance_cle) * (steps - 1) / steps)
+    return mean, std
+
+
+def simulate_basketball_games(n_games, slope_gsw, variance_gsw, slope_cle, variance_cle,
+                              duration=2880, time_step=10, return_paths=False,
+                              margins_only=False, rng=None, chunk_size=20_000):
+    """
+    Vectorized version of simulate_basketball_game(): many games per call.
+
+    Same model (scores start at 0, then steps-1 increments of slope*time_step
+    plus N(0, variance/steps) noise). Paths are a cumsum of a (games, steps-1)
+    noise matrix, with no Python loop over time steps, simulated in chunks of
+    chunk_size games to bound memory. A sum of Gaussian increments is Gaussian,
+    so final scores and margins are drawn directly from their exact
+    distribution: one normal per team (or per margin) per game.
+
+    Returns one of:
+      - return_paths=True:  cumulative_time (steps,), gsw_scores, cle_scores (n_games, steps)
+      - margins_only=True:  final GSW - CLE margins (n_games,)
+      - otherwise:          final gsw_scores, cle_scores (n_games,)
+    """
+    if return_paths and margins_only:
+        raise ValueError("Choose at most one of return_paths and margins_only")
+    rng = np.random.default_rng() if rng is None else rng
+
+    steps = int(duration / time_step)
+    cumulative_time = np.arange(0, duration, time_step)
+    std_gsw = np.sqrt(variance_gsw / steps)
+    std_cle = np.sqrt(variance_cle / steps)
+    drift_gsw = slope_gsw * time_step
+    drift_cle = slope_cle * time_step
+
+    if margins_only:
+        mean, std = final_margin_distribution(slope_gsw, variance_gsw, slope_cle, variance_cle,
+                                              duration, time_step)
+        return mean + std * rng.standard_normal(n_games)
+
+    if not return_paths:
+        # Each final score is N(drift*(steps-1), std^2*(steps-1))
+        gsw_final = drift_gsw * (steps - 1) + std_gsw * np.sqrt(steps - 1) * rng.standard_normal(n_games)
+        cle_final = drift_cle * (steps - 1) + std_cle * np.sqrt(steps - 1) * rng.standard_normal(n_games)
+        return gsw_final, cle_final
+
+    gsw_scores = np.zeros((n_games, steps))
+    cle_scores = np.zeros((n_games, steps))
+    for start in range(0, n_games, chunk_size):
+        stop = min(start + chunk_size, n_games)
+        shape = (stop - start, steps - 1)
+        np.cumsum(drift_gsw + std_gsw * rng.standard_normal(shape), axis=1, out=gsw_scores[start:stop, 1:])
+        np.cumsum(drift_cle + std_cle * rng.standard_normal(shape), axis=1, out=cle_scores[start:stop, 1:])
+    return cumulative_time, gsw_scores, cle_scores
+
+
 def save_simulation_plot(cumulative_time, gsw_scores, cle_scores, season: str, out_dir="plots"):
     os.makedirs(out_dir, exist_ok=True)
     plt.figure(figsize=(10, 6))
@@ -70,7 +118,7 @@ def save_simulation_plot(cumulative_time, gsw_scores, cle_scores, season: str, o
     print(f"Saved simulation plot: {out_path}")
 
 
-def main():
+def main(batched: bool = False):
     os.makedirs("plots", exist_ok=True)
 
     # Seasons that were saved by calc_residuals.py
@@ -84,13 +132,37 @@ def main():
               f"CLE slope={mean_cle_slope:.6f}, var={mean_cle_var:.6f}")
 
         # 2) Simulate a game using the loaded means
-        cum_t, gsw_sim, cle_sim = simulate_basketball_game(
-            mean_gsw_slope, mean_gsw_var, mean_cle_slope, mean_cle_var, time_step=10
-        )
+        if batched:
+            cum_t, gsw_sim, cle_sim = simulate_basketball_games(
+                1, mean_gsw_slope, mean_gsw_var, mean_cle_slope, mean_cle_var,
+                time_step=10, return_paths=True
+            )
+            gsw_sim, cle_sim = gsw_sim[0], cle_sim[0]
+        else:
+            cum_t, gsw_sim, cle_sim = simulate_basketball_game(
+                mean_gsw_slope, mean_gsw_var, mean_cle_slope, mean_cle_var, time_step=10
+            )
 
         # 3) Save simulation plot
         save_simulation_plot(cum_t, gsw_sim, cle_sim, season)
 
+        if not batched:
+            continue
+
+        # 4) Many games at once: how often does GSW win a single game?
+        n_games = 1_000_000
+        t0 = time.perf_counter()
+        margins = simulate_basketball_games(
+            n_games, mean_gsw_slope, mean_gsw_var, mean_cle_slope, mean_cle_var,
+            margins_only=True
+        )
+        elapsed = time.perf_counter() - t0
+        print(f"{season}: simulated {n_games:,} games in {elapsed:.2f} s -> "
+              f"GSW wins {np.mean(margins > 0):.1%}, mean margin {margins.mean():+.2f}")
+
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Simulate Finals games from the saved season means.")
+    parser.add_argument("--batched", action="store_true",
+                        help="use simulate_basketball_games() and also estimate single-game win rates")
+    main(batched=parser.parse_args().batched)
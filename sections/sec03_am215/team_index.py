@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# team_index.py
+# Slope/variance for every team in every season, fitted once and stored in a
+# table keyed by (team, season), plus a vectorized simulator for any matchups.
+# Requirements: numpy, pandas, pyarrow, scipy
+
+import os
+import re
+import glob
+import time
+import itertools
+import numpy as np
+import pandas as pd
+from calc_residuals_and_slope import fit_team_games
+from simulate_game import final_margin_distribution
+from simulate_best_of_seven import series_outcomes, series_win_probability, margin_win_probability
+
+INDEX_PATH = 'results/team_index.parquet'
+LISTING_PATTERN = 'finals_ids/finals_games_*.csv'
+
+
+def season_from_listing(path: str) -> str:
+    """finals_ids/finals_games_15.csv -> '2014-15'"""
+    m = re.search(r'_(\d{2})\.csv$', path)
+    if m is None:
+        raise ValueError(f"Cannot infer season from {path}")
+    end = int(m.group(1))
+    return f"20{end - 1:02d}-{end:02d}"
+
+
+def load_game_listings(pattern: str = LISTING_PATTERN) -> pd.DataFrame:
+    """
+    All game listings matching pattern (columns GAME_ID, GAME_DATE, MATCHUP, ...),
+    with a season column. Listings that already have a SEASON column keep it.
+    """
+    frames = []
+    for path in sorted(glob.glob(pattern)):
+        df = pd.read_csv(path)
+        df['season'] = df['SEASON'] if 'SEASON' in df.columns else season_from_listing(path)
+        frames.append(df)
+    if not frames:
+        raise FileNotFoundError(f"No game listings match {pattern}")
+    # A game can be listed once per team; keep one row per game
+    return pd.concat(frames, ignore_index=True).drop_duplicates('GAME_ID')
+
+
+def build_team_index(games: pd.DataFrame, path: str = INDEX_PATH) -> pd.DataFrame:
+    """
+    Fit every team in every game once, then average per (team, season).
+    Saves and returns a table indexed by (team, season) with columns
+    slope (mean points/sec), variance (mean residual variance), n_games.
+    """
+    fits, _ = fit_team_games(games)
+    seasons = dict(zip(games['GAME_ID'].astype(int), games['season']))
+    fits['season'] = fits['game_id'].map(seasons)
+    index = (fits.groupby(['team', 'season'])
+                 .agg(slope=('slope', 'mean'), variance=('variance', 'mean'),
+                      n_games=('game_id', 'size'))
+                 .sort_index())
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    index.to_parquet(path)
+    print(f"Saved team index ({len(index)} team-seasons) to {path}")
+    return index
+
+
+class TeamIndex:
+    """
+    Read-only (team, season) -> (slope, variance) lookup over a saved team index.
+    Lookups are dict accesses, so pulling parameters for a matchup is O(1).
+    """
+
+    def __init__(self, path: str = INDEX_PATH):
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Missing {path}. Run team_index.py first to build it.")
+        self.table = pd.read_parquet(path)
+        self._params = dict(zip(self.table.index,
+                                zip(self.table['slope'].to_numpy(), self.table['variance'].to_numpy())))
+
+    def __getitem__(self, key):
+        """(team, season) -> (slope, variance)"""
+        try:
+            return self._params[key]
+        except KeyError:
+            raise KeyError(f"No parameters for team/season {key}") from None
+
+    def __contains__(self, key):
+        return key in self._params
+
+    def __len__(self):
+        return len(self._params)
+
+    def keys(self):
+        return list(self._params)
+
+
+def simulate_matchups(index: TeamIndex, pairings, num_series: int = 1_000_000,
+                      rng=None, max_games_per_chunk: int = 10_000_000) -> pd.DataFrame:
+    """
+    Best-of-7 ensembles for many matchups in one vectorized job.
+
+    pairings: list of ((team_a, season_a), (team_b, season_b)); team_a plays the
+    role of "GSW" (the team whose win probability is reported).
+
+    Game margins are drawn from their exact Gaussian distribution for all
+    pairings at once, as a (pairings, series, 7) array per chunk.
+
+    Returns a DataFrame with one row per pairing: p_game and p_series_exact
+    (closed form), p_series (simulated) with its standard error, and the
+    simulated fraction of series lasting 4-7 games.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    params = np.array([index[a] + index[b] for a, b in pairings], dtype=float)
+    mean, std = final_margin_distribution(params[:, 0], params[:, 1], params[:, 2], params[:, 3])
+    n_pairs = len(pairings)
+
+    wins = np.zeros(n_pairs, dtype=np.int64)
+    lengths = np.zeros((n_pairs, 8), dtype=np.int64)
+    chunk = max(1, max_games_per_chunk // (7 * n_pairs))
+    for start in range(0, num_series, chunk):
+        n = min(chunk, num_series - start)
+        margins = mean[:, None, None] + std[:, None, None] * rng.standard_normal((n_pairs, n, 7))
+        won, length = series_outcomes((margins > 0).reshape(-1, 7))
+        wins += won.reshape(n_pairs, n).sum(axis=1)
+        pair = np.repeat(np.arange(n_pairs), n)
+        lengths += np.bincount(pair * 8 + length, minlength=8 * n_pairs).reshape(n_pairs, 8)
+
+    p_game = margin_win_probability(mean, std)
+    p_series = wins / num_series
+    result = pd.DataFrame({
+        'team_a': [a[0] for a, _ in pairings], 'season_a': [a[1] for a, _ in pairings],
+        'team_b': [b[0] for _, b in pairings], 'season_b': [b[1] for _, b in pairings],
+        'p_game': p_game,
+        'p_series_exact': series_win_probability(p_game),
+        'p_series': p_series,
+        'se': np.sqrt(p_series * (1 - p_series) / num_series),
+    })
+    for k in range(4, 8):
+        result[f'len_{k}'] = lengths[:, k] / num_series
+    return result
+
+
+def main():
+    games = load_game_listings()
+    print(f"Loaded {len(games)} games from {LISTING_PATTERN}")
+    build_team_index(games)
+
+    index = TeamIndex()
+    print(index.table, "\n")
+
+    # Every team-season against every other (including across seasons)
+    pairings = list(itertools.combinations(index.keys(), 2))
+    num_series = 1_000_000
+    t0 = time.perf_counter()
+    result = simulate_matchups(index, pairings, num_series=num_series)
+    elapsed = time.perf_counter() - t0
+    print(f"Simulated {len(pairings)} matchups x {num_series:,} series in {elapsed:.2f} s\n")
+    with pd.option_context('display.width', 160, 'display.max_columns', None,
+                           'display.float_format', '{:.4f}'.format):
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
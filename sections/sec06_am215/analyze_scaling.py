@@ -10,9 +10,11 @@ import numpy as np
 import matplotlib.pyplot as plt
 from distributions import GaussianSampler
 from evd_analyzer import EVDAnalyzer
+from result_cache import MaximaCache
 
 
-def analyze_scaling(distribution, Ns, n_trials=1500):
+def analyze_scaling(distribution, Ns, n_trials=1500, seed=None, cache=None,
+                    chunk_size=None, dtype=np.float64):
     """
     Compute mean and std of maxima for different sample sizes.
     
@@ -24,6 +26,14 @@ def analyze_scaling(distribution, Ns, n_trials=1500):
         Array of sample sizes to test
     n_trials : int
         Number of trials for each N
+    seed : int, optional
+        Base seed; each N is sampled from a generator seeded by (seed, N)
+    cache : MaximaCache, optional
+        Persistent cache, so only sample sizes not seen before are computed
+    chunk_size : int, optional
+        Trials per chunk; bounds memory for large N (see EVDAnalyzer)
+    dtype : np.float64 or np.float32
+        Sample precision (float32 requires chunk_size)
         
     Returns
     -------
@@ -41,7 +51,9 @@ def analyze_scaling(distribution, Ns, n_trials=1500):
     for i, N in enumerate(Ns):
         print(f"  [{i+1}/{len(Ns)}] N = {N:>8,} ...", end=" ")
         
-        analyzer = EVDAnalyzer(distribution, N=N, n_trials=n_trials)
+        analyzer = EVDAnalyzer(distribution, N=N, n_trials=n_trials,
+                               seed=seed, cache=cache,
+                               chunk_size=chunk_size, dtype=dtype)
         
         means.append(analyzer.mean_max)
         stds.append(analyzer.std_max)
@@ -114,14 +126,16 @@ def main():
     # Sample sizes from ~10 to ~1,000,000
     Ns = np.unique(np.round(np.logspace(1, 6, 10)).astype(int))
     n_trials = 1500
+    cache = MaximaCache()
     
     print(f"Distribution: {gauss}")
     print(f"Sample sizes: {len(Ns)} values from {Ns[0]:,} to {Ns[-1]:,}")
     print(f"Trials per size: {n_trials:,}")
+    print(f"Cache: {cache}")
     print()
     
-    # Run analysis
-    means, stds = analyze_scaling(gauss, Ns, n_trials=n_trials)
+    # Run analysis (previously computed sample sizes are loaded from the cache)
+    means, stds = analyze_scaling(gauss, Ns, n_trials=n_trials, seed=42, cache=cache)
     
     # Create plots
     print("\nCreating plots...")
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Batch extreme value analysis over a directory of race results.
+
+MarathonData analyzes one race and one division at a time. This module
+takes a directory of results files (one CSV per race), computes the best
+time per (race, division, year) in one grouped pass over all rows, fits a
+Gumbel_L to every (race, division) group with the batched fitter, and
+writes a single summary table. With --trend, every group also gets a
+non-stationary fit whose location and log-scale are linear in the year.
+
+Usage: python batch_analyzer.py <results_dir> [--output summary.csv] [--trend]
+"""
+
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from bootstrap import fit_gumbel_batch
+from marathon_store import MarathonStore
+from nonstationary import NonStationaryGumbel
+
+
+def discover_results(root, pattern='**/*.csv', exclude=()):
+    """
+    Find results files under `root`.
+
+    Paths in `exclude` are skipped, so that the summary written by a previous
+    run (e.g. results/batch_summary.csv under root='.') is not read as a race.
+
+    Returns
+    -------
+    dict
+        Maps race name (file name without extension) to path.
+    """
+    paths = sorted(glob.glob(os.path.join(root, pattern), recursive=True))
+    excluded = {os.path.realpath(p) for p in exclude}
+    races = {}
+    for path in paths:
+        if os.path.realpath(path) in excluded:
+            continue
+        name = os.path.splitext(os.path.basename(path))[0]
+        if name in races:
+            # Disambiguate same-named files in different subdirectories
+            name = os.path.splitext(os.path.relpath(path, root))[0].replace(os.sep, '/')
+        races[name] = path
+    return races
+
+
+def _load_race(item):
+    """Load the columns we need for one race through its Parquet cache."""
+    race, path = item
+    store = MarathonStore(path, cache_dir=os.path.join('results', 'marathon_cache', race))
+    df = store.load(columns=['year', 'time_seconds', 'division'])
+    if 'division' not in df.columns:
+        df['division'] = 'All'
+    df = df[['year', 'division', 'time_seconds']]
+    df['division'] = df['division'].astype(str)
+    df['race'] = race
+    return df
+
+
+def load_all(races, n_workers=8):
+    """
+    Load every race, reading files concurrently on a thread pool.
+
+    Only year, division and the precomputed time_seconds are read, and
+    each file goes through its MarathonStore, so re-runs skip CSV parsing.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns race, division (categorical), year, time_seconds.
+    """
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        frames = list(executor.map(_load_race, races.items()))
+    df = pd.concat(frames, ignore_index=True)
+    df['race'] = df['race'].astype('category')
+    df['division'] = df['division'].astype('category')
+    return df
+
+
+def yearly_best_by_group(df):
+    """
+    Best (minimum) time per (race, division, year), in a single groupby.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns race, division, year, time_seconds, sorted by group and year.
+    """
+    best = (df.dropna(subset=['time_seconds'])
+              .groupby(['race', 'division', 'year'], observed=True)['time_seconds']
+              .min()
+              .reset_index())
+    return best.sort_values(['race', 'division', 'year'], ignore_index=True)
+
+
+def to_padded_matrix(best):
+    """
+    Arrange yearly bests as a (n_groups, max_years) matrix padded with NaN.
+
+    This is the layout fit_gumbel_batch() uses to fit data sets of
+    different lengths together.
+
+    Returns
+    -------
+    keys : pd.DataFrame
+        One row (race, division) per group, aligned with the matrix rows.
+    matrix : ndarray, shape (n_groups, max_years)
+    """
+    grouped = best.groupby(['race', 'division'], observed=True, sort=True)
+    row = grouped.ngroup().to_numpy()
+    col = grouped.cumcount().to_numpy()
+    keys = grouped.size().reset_index()[['race', 'division']]
+
+    matrix = np.full((len(keys), col.max() + 1 if len(col) else 0), np.nan)
+    matrix[row, col] = best['time_seconds'].to_numpy()
+    return keys, matrix
+
+
+def _fit_rows(matrix):
+    """Worker: Gumbel_L fit of every row (must be top level to pickle)."""
+    return fit_gumbel_batch(matrix, fit_type='left')
+
+
+def fit_groups(matrix, chunk_size=1000, n_workers=1):
+    """
+    Fit Gumbel_L to every row of the padded matrix.
+
+    Rows are split into chunks of `chunk_size`, which are fitted in
+    parallel on a process pool when n_workers > 1.
+
+    Returns
+    -------
+    loc, scale : ndarray, shape (n_groups,)
+    """
+    chunks = [matrix[i:i + chunk_size] for i in range(0, len(matrix), chunk_size)]
+    if not chunks:
+        return np.array([]), np.array([])
+
+    if n_workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(_fit_rows, chunks))
+    else:
+        results = [_fit_rows(chunk) for chunk in chunks]
+
+    loc = np.concatenate([r[0] for r in results])
+    scale = np.concatenate([r[1] for r in results])
+    return loc, scale
+
+
+def _fit_trend(group):
+    """Worker: linear-trend Gumbel_L fit of one group's yearly bests."""
+    years, times = group
+    if len(times) < 5:
+        return np.nan, np.nan, np.nan, np.nan
+    model = NonStationaryGumbel(years, times, fit_type='left').fit()
+    _, lo, hi = model.profile_interval('loc_trend')
+    return model.params[1], lo, hi, model.params[3]
+
+
+def fit_trends(best, n_workers=1):
+    """
+    Fit a Gumbel_L with a linear trend to every (race, division).
+
+    Groups with fewer than five years are left as NaN.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns race, division, loc_trend (seconds per decade) with its 95%
+        profile-likelihood interval loc_trend_lo/loc_trend_hi, and
+        log_scale_trend (per decade).
+    """
+    grouped = best.groupby(['race', 'division'], observed=True, sort=True)
+    keys = grouped.size().reset_index()[['race', 'division']]
+    groups = [(g['year'].to_numpy(), g['time_seconds'].to_numpy()) for _, g in grouped]
+
+    if n_workers > 1 and len(groups) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(_fit_trend, groups, chunksize=64))
+    else:
+        results = [_fit_trend(group) for group in groups]
+
+    columns = ['loc_trend', 'loc_trend_lo', 'loc_trend_hi', 'log_scale_trend']
+    return keys.join(pd.DataFrame(results, columns=columns, dtype=float))
+
+
+def summarize(best, n_workers=1, trend=False):
+    """
+    One summary row per (race, division).
+
+    If `trend` is True, the columns of fit_trends() are added.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns race, division, n_years, first_year, last_year,
+        best_time, mean_time, std_time, gumbel_loc, gumbel_scale (seconds).
+    """
+    stats = (best.groupby(['race', 'division'], observed=True, sort=True)
+                 .agg(n_years=('year', 'size'),
+                      first_year=('year', 'min'),
+                      last_year=('year', 'max'),
+                      best_time=('time_seconds', 'min'),
+                      mean_time=('time_seconds', 'mean'),
+                      std_time=('time_seconds', 'std'))
+                 .reset_index())
+
+    keys, matrix = to_padded_matrix(best)
+    loc, scale = fit_groups(matrix, n_workers=n_workers)
+    fits = keys.assign(gumbel_loc=loc, gumbel_scale=scale)
+    summary = stats.merge(fits, on=['race', 'division'], how='left')
+    if trend:
+        summary = summary.merge(fit_trends(best, n_workers=n_workers),
+                                on=['race', 'division'], how='left')
+    return summary
+
+
+def write_summary(summary, output):
+    """Write the summary as Parquet or CSV, depending on the file extension."""
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    if output.endswith('.parquet'):
+        summary.to_parquet(output, index=False)
+    else:
+        summary.to_csv(output, index=False)
+    print(f"Saved: {output}")
+
+
+def main(results_dir, output, n_workers, trend=False):
+    print("=" * 70)
+    print(f"Batch EVD analysis of results in {results_dir}")
+    print("=" * 70)
+
+    t0 = time.perf_counter()
+    races = discover_results(results_dir, exclude=[output])
+    if not races:
+        print(f"No results files found in {results_dir}")
+        return
+    print(f"Found {len(races)} results files")
+
+    df = load_all(races)
+    t1 = time.perf_counter()
+    print(f"Loaded {len(df):,} rows in {t1 - t0:.2f}s")
+
+    best = yearly_best_by_group(df)
+    summary = summarize(best, n_workers=n_workers, trend=trend)
+    t2 = time.perf_counter()
+    print(f"Fitted {len(summary):,} (race, division) groups in {t2 - t1:.2f}s\n")
+
+    with pd.option_context('display.width', 120, 'display.max_rows', 20):
+        print(summary)
+    print()
+    write_summary(summary, output)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(
+        description="Fit Gumbel_L to yearly best times for every race and division."
+    )
+    ap.add_argument("results_dir", help="Directory containing results CSV files.")
+    ap.add_argument("--output", default="results/batch_summary.csv",
+                    help="Summary table path (.csv or .parquet).")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="Worker processes for the Gumbel fits.")
+    ap.add_argument("--trend", action="store_true",
+                    help="Also fit a Gumbel_L with a linear trend in the year.")
+    args = ap.parse_args()
+    main(args.results_dir, args.output, args.workers, trend=args.trend)
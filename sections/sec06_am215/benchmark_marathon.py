@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark loading and parsing a large synthetic marathon results file.
+
+Writes a CSV with one row per finisher (default: 10 million rows), then
+compares row-by-row time parsing with the vectorized parse_times(), and
+times the yearly-best groupby.
+
+Usage: python benchmark_marathon.py [n_rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from time_parsing import parse_times
+
+
+def make_synthetic_results(path, n_rows, rng):
+    """Write a results CSV with year, division and hh:mm:ss finish times."""
+    seconds = rng.integers(2 * 3600, 7 * 3600, size=n_rows)
+    h, rem = np.divmod(seconds, 3600)
+    m, s = np.divmod(rem, 60)
+    # Build "hh:mm:ss" strings without a Python loop over rows
+    times = (pd.Series(h).astype(str).str.zfill(2) + ':'
+             + pd.Series(m).astype(str).str.zfill(2) + ':'
+             + pd.Series(s).astype(str).str.zfill(2))
+    times[rng.random(n_rows) < 0.001] = np.nan  # DNFs
+    df = pd.DataFrame({
+        'year': rng.integers(1970, 2021, size=n_rows),
+        'time': times,
+        'division': np.where(rng.random(n_rows) < 0.5, 'Men', 'Women'),
+    })
+    df.to_csv(path, index=False)
+
+
+def parse_time_rowwise(time_str):
+    """Reference scalar parser, applied one row at a time."""
+    if pd.isna(time_str):
+        return np.nan
+    if isinstance(time_str, (int, float)):
+        return float(time_str)
+    try:
+        total = 0.0
+        for part in str(time_str).split(':'):
+            total = total * 60 + float(part)
+        return total
+    except ValueError:
+        return np.nan
+
+
+def timed(label, fn):
+    """Run fn(), print the elapsed time, and return (result, seconds)."""
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    print(f"  {label:<36s} {elapsed:8.2f} s")
+    return result, elapsed
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    rng = np.random.default_rng(42)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'synthetic_results.csv')
+        print(f"Writing {n_rows:,} synthetic rows...")
+        make_synthetic_results(path, n_rows, rng)
+        print(f"  {os.path.getsize(path) / 2**20:.0f} MiB\n")
+
+        df, _ = timed("read_csv (year, time, division)",
+                      lambda: pd.read_csv(path, usecols=['year', 'time', 'division'],
+                                          dtype={'time': str, 'division': 'category'}))
+
+        slow, t_slow = timed("parse row by row (.apply)",
+                             lambda: df['time'].apply(parse_time_rowwise).to_numpy())
+        fast, t_fast = timed("parse vectorized (parse_times)",
+                             lambda: parse_times(df['time']))
+        assert np.allclose(slow, fast, equal_nan=True)
+
+        df['time_seconds'] = fast
+        timed("yearly best (single groupby)",
+              lambda: df.groupby(['division', 'year'], observed=True)['time_seconds'].min())
+
+        print(f"\nVectorized parsing speedup: {t_slow / t_fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
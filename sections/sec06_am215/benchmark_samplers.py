@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the registered samplers.
+
+For every sampler in SAMPLER_REGISTRY, reports raw sampling throughput
+(samples/sec) and how fast maxima can be produced by brute force versus
+the inverse-CDF sample_max() path. Also compares the chunked EVDAnalyzer
+path at float64 versus float32.
+"""
+
+import time
+import numpy as np
+from distributions import SAMPLER_REGISTRY, make_sampler, GaussianSampler, ParetoSampler
+from evd_analyzer import EVDAnalyzer
+
+
+def build_samplers(rng):
+    """One instance of every registered sampler with default parameters."""
+    samplers = {}
+    for name in SAMPLER_REGISTRY:
+        if name == 'mixture':
+            components = [GaussianSampler(rng=rng), ParetoSampler(alpha=2.5, rng=rng)]
+            samplers[name] = make_sampler(name, components=components,
+                                          weights=[0.9, 0.1], rng=rng)
+        else:
+            samplers[name] = make_sampler(name, rng=rng)
+    return samplers
+
+
+def benchmark_sample(distribution, n_samples, repeats=3):
+    """
+    Best-of-`repeats` throughput of distribution.sample().
+
+    Returns
+    -------
+    float
+        Samples per second.
+    """
+    best = np.inf
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        distribution.sample(n_samples)
+        best = min(best, time.perf_counter() - t0)
+    return n_samples / best
+
+
+def benchmark_maxima(distribution, n_trials, N, fast):
+    """
+    Time to draw n_trials maxima of N samples each.
+
+    Returns
+    -------
+    float
+        Underlying samples represented per second (n_trials * N / time).
+    """
+    t0 = time.perf_counter()
+    if fast:
+        distribution.sample_max(n_trials, N)
+    else:
+        np.max(distribution.sample(size=(n_trials, N)), axis=1)
+    return n_trials * N / (time.perf_counter() - t0)
+
+
+def benchmark_dtype(distribution, N, n_trials, chunk_size, dtype, repeats=3):
+    """
+    Best-of-`repeats` throughput of EVDAnalyzer.compute_maxima_chunked().
+
+    Returns
+    -------
+    float
+        Underlying samples per second (n_trials * N / time).
+    """
+    analyzer = EVDAnalyzer(distribution, N=N, n_trials=n_trials,
+                           chunk_size=chunk_size, dtype=dtype)
+    best = np.inf
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        analyzer.compute_maxima_chunked()
+        best = min(best, time.perf_counter() - t0)
+    return n_trials * N / best
+
+
+def main():
+    rng = np.random.default_rng(42)
+    samplers = build_samplers(rng)
+    n_samples = 5_000_000
+    n_trials, N = 2000, 1000
+
+    print("=" * 78)
+    print(f"Sampler throughput ({n_samples:,} samples; maxima: {n_trials} trials x N={N})")
+    print("=" * 78)
+    print(f"{'sampler':<12s} {'sample() /s':>14s} {'brute max /s':>14s} "
+          f"{'sample_max /s':>14s} {'speedup':>9s}")
+
+    for name, dist in samplers.items():
+        rate = benchmark_sample(dist, n_samples)
+        brute = benchmark_maxima(dist, n_trials, N, fast=False)
+        if dist.has_isf:
+            fast = benchmark_maxima(dist, n_trials, N, fast=True)
+            fast_str, speedup = f"{fast:14.3e}", f"{fast / brute:8.0f}x"
+        else:
+            fast_str, speedup = f"{'n/a':>14s}", f"{'-':>9s}"
+        print(f"{name:<12s} {rate:14.3e} {brute:14.3e} {fast_str} {speedup}")
+
+    N, n_trials, chunk_size = 100_000, 400, 50
+    print()
+    print("=" * 78)
+    print(f"Chunked EVDAnalyzer, float64 vs float32 "
+          f"({n_trials} trials x N={N:,}, {chunk_size} trials/chunk)")
+    print("=" * 78)
+    print(f"{'sampler':<12s} {'float64 /s':>14s} {'float32 /s':>14s} {'speedup':>9s}")
+
+    for name, dist in samplers.items():
+        rate64 = benchmark_dtype(dist, N, n_trials, chunk_size, np.float64)
+        rate32 = benchmark_dtype(dist, N, n_trials, chunk_size, np.float32)
+        print(f"{name:<12s} {rate64:14.3e} {rate32:14.3e} {rate32 / rate64:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Bootstrap confidence intervals for Gumbel fits.
+
+A single call to ``stats.gumbel_r.fit`` gives point estimates only. Here we
+resample the data B times, refit every resample, and read confidence
+intervals off the spread of the refitted parameters. To keep 10,000 refits
+fast, all resamples are fitted at once by a vectorized maximum-likelihood
+solver instead of calling scipy in a Python loop.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import stats
+
+
+def fit_gumbel_batch(samples, fit_type='right', max_iter=100, tol=1e-10):
+    """
+    Maximum-likelihood Gumbel fit for every row of a 2D array at once.
+
+    The MLE scale β solves β = mean(x) - Σ x e^{-x/β} / Σ e^{-x/β}, which we
+    solve with Newton's method on all rows simultaneously. The location then
+    follows in closed form: loc = -β log(mean(e^{-x/β})).
+
+    NaN entries are ignored, so data sets of different lengths can be fitted
+    together by padding the shorter rows with NaN. Rows with fewer than two
+    values give NaN parameters.
+
+    Parameters
+    ----------
+    samples : array-like, shape (B, n) or (n,)
+        Each row is one data set to fit.
+    fit_type : str
+        Either 'right' (gumbel_r, for maxima) or 'left' (gumbel_l, for minima)
+    max_iter : int
+        Maximum number of Newton iterations
+    tol : float
+        Relative convergence tolerance on the scale parameter
+
+    Returns
+    -------
+    loc, scale : ndarray, shape (B,)
+        Fitted parameters for each row (scalars if `samples` was 1D).
+    """
+    x = np.asarray(samples, dtype=float)
+    squeeze = x.ndim == 1
+    x = np.atleast_2d(x)
+
+    if fit_type == 'left':
+        # A Gumbel_L for x is a Gumbel_R for -x with the location negated
+        x = -x
+    elif fit_type != 'right':
+        raise ValueError("fit_type must be 'right' or 'left'")
+
+    valid = np.isfinite(x)
+    count = valid.sum(axis=1, keepdims=True)
+    ok = count[:, 0] >= 2
+    count = np.maximum(count, 1)
+
+    # The scale is shift invariant, so work with centered rows for stability;
+    # padding is set to 0 here and excluded via -inf exponents below
+    xbar = np.where(valid, x, 0.0).sum(axis=1, keepdims=True) / count
+    xc = np.where(valid, x - xbar, 0.0)
+
+    # Method-of-moments starting point: std = π β / √6
+    beta = np.sqrt(6.0) * np.sqrt(np.sum(xc**2, axis=1, keepdims=True) / count) / np.pi
+    beta = np.where(beta > 0, beta, 1.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for _ in range(max_iter):
+            e = np.where(valid, -xc / beta, -np.inf)
+            w = np.exp(e - e.max(axis=1, keepdims=True))
+            w /= w.sum(axis=1, keepdims=True)
+            m1 = np.sum(w * xc, axis=1, keepdims=True)
+            m2 = np.sum(w * xc**2, axis=1, keepdims=True)
+
+            g = beta + m1
+            dg = 1.0 + (m2 - m1**2) / beta**2
+            step = g / dg
+            beta = np.maximum(beta - step, 0.5 * beta)
+
+            # NaN steps (rows with no data) must not block convergence
+            if not np.any(np.abs(step) > tol * beta):
+                break
+
+        e = np.where(valid, -xc / beta, -np.inf)
+        emax = e.max(axis=1, keepdims=True)
+        log_mean = emax + np.log(np.sum(np.exp(e - emax), axis=1, keepdims=True) / count)
+        loc = xbar - beta * log_mean
+
+    loc = np.where(ok, loc[:, 0], np.nan)
+    scale = np.where(ok, beta[:, 0], np.nan)
+    if fit_type == 'left':
+        loc = -loc
+
+    if squeeze:
+        return loc[0], scale[0]
+    return loc, scale
+
+
+def return_levels(loc, scale, periods, fit_type='right'):
+    """
+    Gumbel return levels for the given return periods.
+
+    The T-period return level is the value exceeded (for maxima) or
+    undercut (for minima) on average once every T blocks.
+
+    Parameters
+    ----------
+    loc, scale : float or ndarray, shape (B,)
+        Gumbel parameters
+    periods : array-like, shape (k,)
+        Return periods T (in blocks, e.g. years); each must exceed 1
+    fit_type : str
+        'right' for maxima or 'left' for minima
+
+    Returns
+    -------
+    ndarray, shape (B, k) or (k,)
+        Return level for every parameter set and period.
+    """
+    periods = np.asarray(periods, dtype=float)
+    y = np.log(-np.log1p(-1.0 / periods))
+    loc = np.asarray(loc, dtype=float)[..., None]
+    scale = np.asarray(scale, dtype=float)[..., None]
+    if fit_type == 'right':
+        return loc - scale * y
+    return loc + scale * y
+
+
+def _gumbel_statistics(samples, fit_type, periods):
+    """Fit rows of `samples` and stack [loc, scale, return levels...]."""
+    loc, scale = fit_gumbel_batch(samples, fit_type=fit_type)
+    columns = [loc[:, None], scale[:, None]]
+    if len(periods):
+        columns.append(return_levels(loc, scale, periods, fit_type=fit_type))
+    return np.hstack(columns)
+
+
+def _fit_chunk(args):
+    """Worker: fit one chunk of resamples (must be top level to pickle)."""
+    data, indices, fit_type, periods = args
+    return _gumbel_statistics(data[indices], fit_type, periods)
+
+
+class GumbelBootstrap:
+    """
+    Nonparametric bootstrap for Gumbel parameters and return levels.
+
+    All B resamples are drawn up front as a single (B, n) index array, then
+    fitted in chunks by `fit_gumbel_batch`. Chunks can be farmed out to a
+    process pool when B is large.
+
+    Parameters
+    ----------
+    data : array-like
+        Observed block extremes (e.g. maxima per trial, or best time per year)
+    fit_type : str
+        Either 'right' (gumbel_r, for maxima) or 'left' (gumbel_l, for minima)
+    n_boot : int
+        Number of bootstrap resamples B
+    periods : array-like
+        Return periods to report return levels for (default: none)
+    rng : np.random.Generator
+        Random number generator instance
+    chunk_size : int
+        Number of resamples fitted per batch
+    n_workers : int
+        Number of worker processes (1 runs everything in this process)
+    """
+
+    def __init__(self, data, fit_type='right', n_boot=10_000, periods=(),
+                 rng=None, chunk_size=2_000, n_workers=1):
+        self.data = np.asarray(data, dtype=float)
+        self.fit_type = fit_type
+        self.n_boot = n_boot
+        self.periods = np.asarray(periods, dtype=float)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.chunk_size = chunk_size
+        self.n_workers = n_workers
+
+        self.names = ['loc', 'scale'] + [f'return_level_{T:g}' for T in self.periods]
+        self.estimate = _gumbel_statistics(self.data[None, :], fit_type, self.periods)[0]
+        self._replicates = None  # Will be computed lazily
+
+    def resample(self):
+        """
+        Draw bootstrap replicates of every statistic.
+
+        Returns
+        -------
+        ndarray, shape (n_boot, n_statistics)
+            One row of [loc, scale, return levels...] per resample.
+        """
+        n = len(self.data)
+        indices = self.rng.integers(0, n, size=(self.n_boot, n))
+        chunks = [(self.data, indices[i:i + self.chunk_size], self.fit_type, self.periods)
+                  for i in range(0, self.n_boot, self.chunk_size)]
+
+        if self.n_workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
+                results = list(executor.map(_fit_chunk, chunks))
+        else:
+            results = [_fit_chunk(chunk) for chunk in chunks]
+
+        self._replicates = np.vstack(results)
+        return self._replicates
+
+    @property
+    def replicates(self):
+        """Lazy evaluation: resample if not already done."""
+        if self._replicates is None:
+            self.resample()
+        return self._replicates
+
+    def _jackknife(self):
+        """Leave-one-out statistics, shape (n, n_statistics)."""
+        n = len(self.data)
+        keep = ~np.eye(n, dtype=bool)
+        loo = np.broadcast_to(self.data, (n, n))[keep].reshape(n, n - 1)
+        return _gumbel_statistics(loo, self.fit_type, self.periods)
+
+    def percentile_interval(self, alpha=0.05):
+        """
+        Percentile bootstrap interval.
+
+        Parameters
+        ----------
+        alpha : float
+            Two-sided significance level (0.05 gives a 95% interval)
+
+        Returns
+        -------
+        lower, upper : ndarray, shape (n_statistics,)
+        """
+        lower, upper = np.percentile(self.replicates, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0)
+        return lower, upper
+
+    def bca_interval(self, alpha=0.05):
+        """
+        Bias-corrected and accelerated (BCa) bootstrap interval.
+
+        The bias correction z0 comes from the fraction of replicates below
+        the full-sample estimate; the acceleration comes from the skewness
+        of the jackknife estimates.
+
+        Parameters
+        ----------
+        alpha : float
+            Two-sided significance level (0.05 gives a 95% interval)
+
+        Returns
+        -------
+        lower, upper : ndarray, shape (n_statistics,)
+        """
+        reps = self.replicates
+        frac_below = np.mean(reps < self.estimate, axis=0)
+        frac_below = np.clip(frac_below, 1.0 / (len(reps) + 1), 1 - 1.0 / (len(reps) + 1))
+        z0 = stats.norm.ppf(frac_below)
+
+        jack = self._jackknife()
+        diff = jack.mean(axis=0) - jack
+        denom = 6.0 * np.sum(diff**2, axis=0) ** 1.5
+        a = np.divide(np.sum(diff**3, axis=0), denom,
+                      out=np.zeros_like(denom), where=denom > 0)
+
+        bounds = []
+        for z_alpha in stats.norm.ppf([alpha / 2, 1 - alpha / 2]):
+            adjusted = stats.norm.cdf(z0 + (z0 + z_alpha) / (1 - a * (z0 + z_alpha)))
+            bounds.append(np.array([np.percentile(reps[:, j], 100 * adjusted[j])
+                                    for j in range(reps.shape[1])]))
+        return bounds[0], bounds[1]
+
+    def confidence_intervals(self, alpha=0.05, method='percentile'):
+        """
+        Confidence intervals for every statistic, keyed by name.
+
+        Parameters
+        ----------
+        alpha : float
+            Two-sided significance level
+        method : str
+            Either 'percentile' or 'bca'
+
+        Returns
+        -------
+        dict
+            Maps statistic name to (estimate, lower, upper).
+        """
+        if method == 'percentile':
+            lower, upper = self.percentile_interval(alpha)
+        elif method == 'bca':
+            lower, upper = self.bca_interval(alpha)
+        else:
+            raise ValueError("method must be 'percentile' or 'bca'")
+        return {name: (est, lo, hi)
+                for name, est, lo, hi in zip(self.names, self.estimate, lower, upper)}
+
+    def __repr__(self):
+        return (f"GumbelBootstrap(n={len(self.data)}, n_boot={self.n_boot}, "
+                f"type='{self.fit_type}')")
+
+
+def main():
+    """Bootstrap a Gumbel fit to 100 maxima and time 10,000 refits."""
+    print("=" * 70)
+    print("Bootstrap Confidence Intervals for a Gumbel Fit")
+    print("=" * 70)
+
+    rng = np.random.default_rng(42)
+    data = stats.gumbel_r.rvs(loc=3.0, scale=0.4, size=100, random_state=rng)
+
+    loc, scale = fit_gumbel_batch(data)
+    loc_sp, scale_sp = stats.gumbel_r.fit(data)
+    print(f"\nBatched MLE: loc={loc:.4f}, scale={scale:.4f}")
+    print(f"scipy MLE:   loc={loc_sp:.4f}, scale={scale_sp:.4f}")
+
+    boot = GumbelBootstrap(data, n_boot=10_000, periods=[10, 100], rng=rng)
+    t0 = time.perf_counter()
+    boot.resample()
+    t1 = time.perf_counter()
+    print(f"\n{boot}: {boot.n_boot:,} fits in {t1 - t0:.2f}s")
+
+    for method in ['percentile', 'bca']:
+        print(f"\n95% {method} intervals:")
+        for name, (est, lo, hi) in boot.confidence_intervals(method=method).items():
+            print(f"  {name:<20s} {est:8.4f}  [{lo:8.4f}, {hi:8.4f}]")
+
+
+if __name__ == "__main__":
+    main()
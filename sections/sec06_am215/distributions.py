@@ -8,38 +8,142 @@ using abstract base classes and concrete implementations.
 
 from abc import ABC, abstractmethod
 import numpy as np
+from scipy import special
+
+
+# Registry of sampler classes by short name, filled in by @register_sampler
+SAMPLER_REGISTRY = {}
+
+
+def register_sampler(name):
+    """Class decorator that adds a sampler to SAMPLER_REGISTRY under `name`."""
+    def decorator(cls):
+        if name in SAMPLER_REGISTRY:
+            raise ValueError(f"Sampler '{name}' is already registered")
+        SAMPLER_REGISTRY[name] = cls
+        cls.name = name
+        return cls
+    return decorator
+
+
+def make_sampler(name, **params):
+    """
+    Construct a registered sampler by name.
+    
+    Example: make_sampler('pareto', alpha=3.0, rng=rng)
+    """
+    try:
+        cls = SAMPLER_REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"Unknown sampler '{name}'. "
+                         f"Available: {', '.join(sorted(SAMPLER_REGISTRY))}") from None
+    return cls(**params)
 
 
 class BaseDistribution(ABC):
     """
     Abstract base class for probability distributions.
     
-    Subclasses must implement the sample() method.
+    Subclasses must implement the sample() method. Subclasses with a
+    closed-form inverse survival function should also override isf(), which
+    enables the fast sample_max() path.
+    
+    sample() accepts `dtype` (float64 or float32) and `out` so callers can
+    fill a preallocated buffer in place. For max-finding, float32 halves the
+    memory traffic at a precision that is more than sufficient.
     """
     
     @abstractmethod
-    def sample(self, size):
+    def sample(self, size=None, dtype=np.float64, out=None):
         """
         Draw samples from the distribution.
         
         Parameters
         ----------
         size : int or tuple of ints
-            Shape of the output array.
+            Shape of the output array (ignored if `out` is given).
+        dtype : np.float64 or np.float32
+            Precision of the samples (ignored if `out` is given).
+        out : ndarray, optional
+            C-contiguous float64/float32 array to fill in place.
             
         Returns
         -------
         samples : ndarray
-            Random samples from the distribution.
+            Random samples from the distribution (`out` itself, if given).
         """
         pass
     
+    @staticmethod
+    def _output(size, dtype, out):
+        """Return `out` after validating it, or allocate a new array."""
+        if out is None:
+            if size is None:
+                raise ValueError("Either size or out must be given")
+            out = np.empty(size, dtype=dtype)
+        if out.dtype not in (np.float64, np.float32):
+            raise TypeError(f"dtype must be float64 or float32, got {out.dtype}")
+        if not out.flags.c_contiguous:
+            raise ValueError("out must be C-contiguous")
+        return out
+    
+    def isf(self, q):
+        """
+        Inverse survival function: the x with P(X > x) = q.
+        
+        Not every distribution has one in closed form; those that do
+        override this method.
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no closed-form isf")
+    
+    def samplers(self):
+        """
+        This sampler and every sampler it draws from, each once.
+        
+        Composite samplers (e.g. mixtures) extend this, so callers can
+        reseed every generator involved in a draw.
+        """
+        return [self]
+    
+    @property
+    def has_isf(self):
+        """True if this sampler overrides isf() (fast sample_max path)."""
+        return type(self).isf is not BaseDistribution.isf
+    
+    def sample_max(self, n_trials, N):
+        """
+        Draw the maximum of N samples, n_trials times.
+        
+        If the distribution has a closed-form isf(), the maximum is sampled
+        directly: P(M_N > x) = 1 - C(x)^N, so with U uniform,
+        M_N = isf(1 - U^(1/N)). This costs O(n_trials) instead of
+        O(n_trials * N). Otherwise we fall back to brute-force sampling.
+        
+        Parameters
+        ----------
+        n_trials : int
+            Number of maxima to draw
+        N : int
+            Number of samples each maximum is taken over
+            
+        Returns
+        -------
+        maxima : ndarray, shape (n_trials,)
+        """
+        if not self.has_isf:
+            return np.max(self.sample(size=(n_trials, N)), axis=1)
+        u = self.rng.random(n_trials)
+        # 1 - U^(1/N), computed without cancellation for large N
+        q = -np.expm1(np.log(u) / N)
+        return self.isf(q)
+    
     @abstractmethod
     def __repr__(self):
         """String representation of the distribution."""
         pass
 
 
+@register_sampler('gaussian')
 class GaussianSampler(BaseDistribution):
     """
     Sampler for Gaussian (Normal) distribution.
@@ -59,15 +163,24 @@ class GaussianSampler(BaseDistribution):
         self.sigma = sigma
         self.rng = rng if rng is not None else np.random.default_rng()
     
-    def sample(self, size):
+    def sample(self, size=None, dtype=np.float64, out=None):
         """Draw samples from Gaussian distribution."""
-        return self.rng.normal(loc=self.mu, scale=self.sigma, size=size)
+        out = self._output(size, dtype, out)
+        self.rng.standard_normal(dtype=out.dtype, out=out)
+        out *= self.sigma
+        out += self.mu
+        return out
+    
+    def isf(self, q):
+        """Inverse survival function of the Gaussian."""
+        return self.mu - self.sigma * special.ndtri(q)
     
     def __repr__(self):
         """String representation of the sampler."""
         return f"GaussianSampler(mu={self.mu}, sigma={self.sigma})"
 
 
+@register_sampler('exponential')
 class ExponentialSampler(BaseDistribution):
     """
     Sampler for Exponential distribution.
@@ -84,14 +197,275 @@ class ExponentialSampler(BaseDistribution):
         self.scale = scale
         self.rng = rng if rng is not None else np.random.default_rng()
     
-    def sample(self, size):
+    def sample(self, size=None, dtype=np.float64, out=None):
         """Draw samples from Exponential distribution."""
-        return self.rng.exponential(scale=self.scale, size=size)
+        out = self._output(size, dtype, out)
+        self.rng.standard_exponential(dtype=out.dtype, out=out)
+        out *= self.scale
+        return out
+    
+    def isf(self, q):
+        """Inverse survival function of the Exponential."""
+        return -self.scale * np.log(q)
     
     def __repr__(self):
         return f"ExponentialSampler(scale={self.scale})"
 
 
+@register_sampler('pareto')
+class ParetoSampler(BaseDistribution):
+    """
+    Sampler for Pareto (power-law) distribution, P(X > x) = (x_m / x)^alpha.
+    
+    Power-law tail: maxima fall in the Fréchet domain of attraction.
+    
+    Parameters
+    ----------
+    alpha : float
+        Tail index (default: 3.0)
+    xm : float
+        Minimum value / scale (default: 1.0)
+    rng : np.random.Generator
+        Random number generator instance
+    """
+    
+    def __init__(self, alpha=3.0, xm=1.0, rng=None):
+        self.alpha = alpha
+        self.xm = xm
+        self.rng = rng if rng is not None else np.random.default_rng()
+    
+    def sample(self, size=None, dtype=np.float64, out=None):
+        """Draw samples from Pareto distribution."""
+        # X = x_m * exp(E / alpha) with E standard exponential
+        out = self._output(size, dtype, out)
+        self.rng.standard_exponential(dtype=out.dtype, out=out)
+        out /= self.alpha
+        np.exp(out, out=out)
+        out *= self.xm
+        return out
+    
+    def isf(self, q):
+        """Inverse survival function of the Pareto."""
+        return self.xm * q ** (-1.0 / self.alpha)
+    
+    def __repr__(self):
+        return f"ParetoSampler(alpha={self.alpha}, xm={self.xm})"
+
+
+@register_sampler('student_t')
+class StudentTSampler(BaseDistribution):
+    """
+    Sampler for Student's t distribution.
+    
+    Power-law tail with index df: maxima fall in the Fréchet domain.
+    
+    Parameters
+    ----------
+    df : float
+        Degrees of freedom (default: 3.0)
+    loc : float
+        Location (default: 0.0)
+    scale : float
+        Scale (default: 1.0)
+    rng : np.random.Generator
+        Random number generator instance
+    """
+    
+    def __init__(self, df=3.0, loc=0.0, scale=1.0, rng=None):
+        self.df = df
+        self.loc = loc
+        self.scale = scale
+        self.rng = rng if rng is not None else np.random.default_rng()
+    
+    def sample(self, size=None, dtype=np.float64, out=None):
+        """Draw samples from Student's t distribution."""
+        # T = Z / sqrt(V / df) with V ~ chi2(df) = 2 * Gamma(df / 2)
+        out = self._output(size, dtype, out)
+        gamma = self.rng.standard_gamma(self.df / 2, size=out.shape, dtype=out.dtype)
+        self.rng.standard_normal(dtype=out.dtype, out=out)
+        gamma *= 2.0 / self.df
+        np.sqrt(gamma, out=gamma)
+        out /= gamma
+        out *= self.scale
+        out += self.loc
+        return out
+    
+    def isf(self, q):
+        """Inverse survival function of Student's t (uses symmetry for precision)."""
+        return self.loc - self.scale * special.stdtrit(self.df, q)
+    
+    def __repr__(self):
+        return f"StudentTSampler(df={self.df}, loc={self.loc}, scale={self.scale})"
+
+
+@register_sampler('uniform')
+class UniformSampler(BaseDistribution):
+    """
+    Sampler for Uniform distribution on [low, high).
+    
+    Bounded support: maxima fall in the Weibull domain of attraction.
+    
+    Parameters
+    ----------
+    low : float
+        Lower bound (default: 0.0)
+    high : float
+        Upper bound (default: 1.0)
+    rng : np.random.Generator
+        Random number generator instance
+    """
+    
+    def __init__(self, low=0.0, high=1.0, rng=None):
+        self.low = low
+        self.high = high
+        self.rng = rng if rng is not None else np.random.default_rng()
+    
+    def sample(self, size=None, dtype=np.float64, out=None):
+        """Draw samples from Uniform distribution."""
+        out = self._output(size, dtype, out)
+        self.rng.random(dtype=out.dtype, out=out)
+        out *= self.high - self.low
+        out += self.low
+        return out
+    
+    def isf(self, q):
+        """Inverse survival function of the Uniform."""
+        return self.high - q * (self.high - self.low)
+    
+    def __repr__(self):
+        return f"UniformSampler(low={self.low}, high={self.high})"
+
+
+@register_sampler('beta')
+class BetaSampler(BaseDistribution):
+    """
+    Sampler for Beta distribution on [0, 1].
+    
+    Bounded support: maxima fall in the Weibull domain of attraction.
+    
+    Parameters
+    ----------
+    a : float
+        First shape parameter (default: 2.0)
+    b : float
+        Second shape parameter; controls the tail near 1 (default: 2.0)
+    rng : np.random.Generator
+        Random number generator instance
+    """
+    
+    def __init__(self, a=2.0, b=2.0, rng=None):
+        self.a = a
+        self.b = b
+        self.rng = rng if rng is not None else np.random.default_rng()
+    
+    def sample(self, size=None, dtype=np.float64, out=None):
+        """Draw samples from Beta distribution."""
+        # X = G_a / (G_a + G_b) with independent standard gammas
+        out = self._output(size, dtype, out)
+        self.rng.standard_gamma(self.a, dtype=out.dtype, out=out)
+        total = self.rng.standard_gamma(self.b, size=out.shape, dtype=out.dtype)
+        total += out
+        out /= total
+        return out
+    
+    def isf(self, q):
+        """Inverse survival function of the Beta (1 - X is Beta(b, a))."""
+        return 1.0 - special.betaincinv(self.b, self.a, q)
+    
+    def __repr__(self):
+        return f"BetaSampler(a={self.a}, b={self.b})"
+
+
+@register_sampler('lognormal')
+class LogNormalSampler(BaseDistribution):
+    """
+    Sampler for log-normal distribution.
+    
+    Heavier than exponential but lighter than any power law: maxima
+    converge (slowly) to Gumbel.
+    
+    Parameters
+    ----------
+    mu : float
+        Mean of the underlying normal (default: 0.0)
+    sigma : float
+        Standard deviation of the underlying normal (default: 1.0)
+    rng : np.random.Generator
+        Random number generator instance
+    """
+    
+    def __init__(self, mu=0.0, sigma=1.0, rng=None):
+        self.mu = mu
+        self.sigma = sigma
+        self.rng = rng if rng is not None else np.random.default_rng()
+    
+    def sample(self, size=None, dtype=np.float64, out=None):
+        """Draw samples from log-normal distribution."""
+        out = self._output(size, dtype, out)
+        self.rng.standard_normal(dtype=out.dtype, out=out)
+        out *= self.sigma
+        out += self.mu
+        np.exp(out, out=out)
+        return out
+    
+    def isf(self, q):
+        """Inverse survival function of the log-normal."""
+        return np.exp(self.mu - self.sigma * special.ndtri(q))
+    
+    def __repr__(self):
+        return f"LogNormalSampler(mu={self.mu}, sigma={self.sigma})"
+
+
+@register_sampler('mixture')
+class MixtureSampler(BaseDistribution):
+    """
+    Sampler for a finite mixture of other samplers.
+    
+    The heaviest-tailed component determines the domain of attraction.
+    There is no closed-form isf, so sample_max() uses brute-force sampling.
+    
+    Parameters
+    ----------
+    components : list of BaseDistribution
+        Component distributions
+    weights : array-like
+        Mixture weights (normalized to sum to 1; default: equal weights)
+    rng : np.random.Generator
+        Random number generator for choosing components
+    """
+    
+    def __init__(self, components, weights=None, rng=None):
+        self.components = list(components)
+        if weights is None:
+            weights = np.ones(len(self.components))
+        weights = np.asarray(weights, dtype=float)
+        self.weights = weights / weights.sum()
+        self.rng = rng if rng is not None else np.random.default_rng()
+    
+    def sample(self, size=None, dtype=np.float64, out=None):
+        """Draw samples from the mixture, one vectorized draw per component."""
+        out = self._output(size, dtype, out)
+        which = self.rng.choice(len(self.components), size=out.shape, p=self.weights)
+        for k, component in enumerate(self.components):
+            mask = which == k
+            out[mask] = component.sample(int(mask.sum()), dtype=out.dtype)
+        return out
+    
+    def samplers(self):
+        """The mixture itself, then its components (recursively), each once."""
+        found = [self]
+        for component in self.components:
+            for sampler in component.samplers():
+                if not any(sampler is f for f in found):
+                    found.append(sampler)
+        return found
+    
+    def __repr__(self):
+        # Full-precision weights, so different mixtures never share a cache key
+        weights = ", ".join(repr(float(w)) for w in self.weights)
+        return f"MixtureSampler(components={self.components}, weights=[{weights}])"
+
+
 if __name__ == "__main__":
     # Test the samplers
     rng = np.random.default_rng(42)
@@ -108,5 +482,7 @@ if __name__ == "__main__":
     
     print(f"\nGaussian samples (n=5): {gauss_samples}")
     print(f"Exponential samples (n=5): {expo_samples}")
+    
+    print(f"\nRegistered samplers: {', '.join(SAMPLER_REGISTRY)}")
     print("\nIf you see samples above, TODOs in distributions.py are complete!")
 
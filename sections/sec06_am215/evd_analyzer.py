@@ -26,12 +26,32 @@ class EVDAnalyzer:
         Number of samples per trial
     n_trials : int
         Number of trials (each produces one maximum)
+    seed : int, optional
+        If given, maxima are drawn from a generator seeded by (seed, N),
+        so the result depends only on the inputs and can be cached
+    cache : MaximaCache, optional
+        Persistent cache to read maxima from / write maxima to
+        (requires a seed)
+    chunk_size : int, optional
+        If given, maxima are computed chunk_size trials at a time by
+        compute_maxima_chunked(), reusing one scratch buffer
+    dtype : np.float64 or np.float32
+        Sample precision for the chunked path (float32 halves memory traffic)
     """
     
-    def __init__(self, distribution, N, n_trials=2000):
+    def __init__(self, distribution, N, n_trials=2000, seed=None, cache=None,
+                 chunk_size=None, dtype=np.float64):
+        if cache is not None and seed is None:
+            raise ValueError("A seed is required to cache maxima")
+        if chunk_size is None and np.dtype(dtype) != np.float64:
+            raise ValueError("dtype other than float64 requires chunk_size")
         self.distribution = distribution
         self.N = N
         self.n_trials = n_trials
+        self.seed = seed
+        self.cache = cache
+        self.chunk_size = chunk_size
+        self.dtype = np.dtype(dtype)
         self._maxima = None  # Will be computed lazily
     
     def compute_maxima(self):
@@ -51,11 +71,70 @@ class EVDAnalyzer:
         # TODO: Implement batched sampling and max computation
         raise NotImplementedError("Students need to implement compute_maxima()")
     
+    def compute_maxima_chunked(self):
+        """
+        Generate maxima chunk_size trials at a time, in self.dtype.
+        
+        One (chunk_size, N) scratch buffer is allocated up front and
+        refilled in place by distribution.sample(out=...) for every chunk,
+        so memory use is bounded and no new arrays are allocated per chunk.
+        """
+        rows = min(self.chunk_size, self.n_trials)
+        scratch = np.empty((rows, self.N), dtype=self.dtype)
+        maxima = np.empty(self.n_trials, dtype=self.dtype)
+        
+        for start in range(0, self.n_trials, rows):
+            stop = min(start + rows, self.n_trials)
+            buf = scratch[:stop - start]
+            self.distribution.sample(out=buf)
+            np.max(buf, axis=1, out=maxima[start:stop])
+        
+        self._maxima = maxima
+        return maxima
+    
+    def _compute(self):
+        """Dispatch to the chunked or plain maxima computation."""
+        if self.chunk_size is None:
+            self.compute_maxima()
+        else:
+            self.compute_maxima_chunked()
+    
+    def _compute_seeded(self):
+        """
+        Compute maxima with the distribution reseeded from (seed, N).
+        
+        The distribution gets a generator seeded by (seed, N); any samplers it
+        draws from (e.g. mixture components) get generators spawned from the
+        same SeedSequence, so the whole draw is reproducible.
+        """
+        if self.seed is None:
+            self._compute()
+            return self._maxima
+        
+        samplers = self.distribution.samplers()
+        saved_rngs = [sampler.rng for sampler in samplers]
+        seq = np.random.SeedSequence([self.seed, self.N])
+        rngs = [np.random.default_rng(seq)]
+        rngs += [np.random.default_rng(child) for child in seq.spawn(len(samplers) - 1)]
+        for sampler, rng in zip(samplers, rngs):
+            sampler.rng = rng
+        try:
+            self._compute()
+        finally:
+            for sampler, rng in zip(samplers, saved_rngs):
+                sampler.rng = rng
+        return self._maxima
+    
     @property
     def maxima(self):
-        """Lazy evaluation: compute maxima if not already done."""
+        """Lazy evaluation: compute maxima (or load from cache) if not already done."""
         if self._maxima is None:
-            self.compute_maxima()
+            if self.cache is not None:
+                self._maxima = self.cache.get_or_compute(
+                    self.distribution, self.N, self.n_trials, self.seed,
+                    self._compute_seeded, dtype=self.dtype, chunk_size=self.chunk_size)
+            else:
+                self._compute_seeded()
         return self._maxima
     
     @property
@@ -96,7 +175,7 @@ class EVDAnalyzer:
     
     def __repr__(self):
         return (f"EVDAnalyzer(distribution={self.distribution}, "
-                f"N={self.N}, n_trials={self.n_trials})")
+                f"N={self.N}, n_trials={self.n_trials}, dtype={self.dtype})")
 
 
 def main():
@@ -11,6 +11,7 @@ import matplotlib.pyplot as plt
 from scipy import stats
 from distributions import GaussianSampler, ExponentialSampler
 from evd_analyzer import EVDAnalyzer
+from bootstrap import GumbelBootstrap
 
 
 class GumbelFitter:
@@ -47,6 +48,29 @@ class GumbelFitter:
         """Evaluate Gumbel CDF at points x."""
         return self._dist.cdf(x)
     
+    def bootstrap(self, n_boot=10_000, periods=(), rng=None, n_workers=1):
+        """
+        Bootstrap the fit to get confidence intervals.
+        
+        Parameters
+        ----------
+        n_boot : int
+            Number of bootstrap resamples
+        periods : array-like
+            Return periods to compute return levels for
+        rng : np.random.Generator
+            Random number generator instance
+        n_workers : int
+            Number of worker processes for fitting resamples
+        
+        Returns
+        -------
+        GumbelBootstrap
+            Call .confidence_intervals(method='percentile' or 'bca') on it.
+        """
+        return GumbelBootstrap(self.data, fit_type=self.fit_type, n_boot=n_boot,
+                               periods=periods, rng=rng, n_workers=n_workers)
+    
     def plot_fit(self, ax=None, bins=50, data_label='Data', fit_label='Gumbel Fit'):
         """
         Plot histogram of data with fitted Gumbel overlay.
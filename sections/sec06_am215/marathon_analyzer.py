@@ -6,11 +6,17 @@ Demonstrates application of Gumbel distribution to real data, with attention
 to assumptions and limitations.
 """
 
+import os
 import re
+import argparse
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from scipy import stats
+from bootstrap import GumbelBootstrap
+from marathon_store import MarathonStore
+from nonstationary import NonStationaryGumbel
+from time_parsing import parse_times
 
 
 class MarathonData:
@@ -29,18 +35,33 @@ class MarathonData:
         Path to CSV file with marathon data
     division : str, optional
         Filter by division ('Men', 'Women', or None for all)
+    usecols : list of str, optional
+        Only load these columns (e.g. ['year', 'time', 'division']); for
+        large results files this skips parsing every other column
+    cache : bool
+        If True, load through a MarathonStore: the CSV is converted once to
+        Parquet (partitioned by division, with time_seconds precomputed)
+        and later loads read only this division's partition
     """
     
-    def __init__(self, csv_path, division='Men'):
+    def __init__(self, csv_path, division='Men', usecols=None, cache=False):
         self.csv_path = csv_path
         self.division = division
+        self.usecols = usecols
+        self.cache = cache
         self.df = None
         self.yearly_best_times = None
         self._load_data()
     
     def _load_data(self):
         """Load CSV and validate required columns."""
-        self.df = pd.read_csv(self.csv_path)
+        if self.cache:
+            self._load_cached()
+            return
+        
+        # Read times as strings so parse_times() sees them unmodified
+        self.df = pd.read_csv(self.csv_path, usecols=self.usecols,
+                              dtype={'time': str, 'division': 'category'})
         
         # Validate columns
         required = ['year', 'time']
@@ -55,6 +76,20 @@ class MarathonData:
         else:
             print(f"Loaded {len(self.df)} rows from {self.csv_path}")
     
+    def _load_cached(self):
+        """Load only this division's rows and the needed columns from Parquet."""
+        if not os.path.isfile(self.csv_path):
+            raise FileNotFoundError(self.csv_path)
+        store = MarathonStore(self.csv_path)
+        self.df = store.load(division=self.division, columns=self.usecols)
+        
+        for col in ['year', 'time']:
+            if col not in self.df.columns:
+                raise ValueError(f"CSV must contain '{col}' column")
+        
+        division_str = f" ({self.division} division)" if self.division else ""
+        print(f"Loaded {len(self.df)} rows{division_str} from {store.dataset_path}")
+    
     def parse_time(self, time_str):
         """
         Convert time string to seconds.
@@ -106,6 +141,26 @@ class MarathonData:
         
         return self.yearly_best_times
     
+    def yearly_best_vectorized(self):
+        """
+        Same result as yearly_best, without the row-by-row parse.
+        
+        All times are converted at once by parse_times() (or taken from a
+        precomputed time_seconds column, e.g. from the Parquet cache), then
+        a single groupby takes the minimum per year. Used by the trend and
+        bootstrap fits, so they also work on very large results files.
+        
+        Returns
+        -------
+        pd.Series
+            Best time (seconds) for each year, indexed by year
+        """
+        if 'time_seconds' in self.df.columns:
+            seconds = self.df['time_seconds']
+        else:
+            seconds = pd.Series(parse_times(self.df['time']), index=self.df.index)
+        return seconds.groupby(self.df['year']).min().dropna().sort_index()
+    
     def fit_gumbel_left(self):
         """
         Fit Gumbel_L (left-skewed) distribution to yearly best times.
@@ -121,6 +176,59 @@ class MarathonData:
         loc, scale = stats.gumbel_l.fit(times)
         return loc, scale
     
+    def bootstrap_gumbel_left(self, n_boot=10_000, periods=(10, 50), rng=None, n_workers=1):
+        """
+        Bootstrap the Gumbel_L fit to yearly best times.
+        
+        Parameters
+        ----------
+        n_boot : int
+            Number of bootstrap resamples
+        periods : array-like
+            Return periods (years) for return levels, i.e. the time beaten
+            on average once every T years
+        rng : np.random.Generator
+            Random number generator instance
+        n_workers : int
+            Number of worker processes for fitting resamples
+        
+        Returns
+        -------
+        GumbelBootstrap
+            Call .confidence_intervals(method='percentile' or 'bca') on it.
+        """
+        return GumbelBootstrap(self.yearly_best_vectorized().values, fit_type='left', n_boot=n_boot,
+                               periods=periods, rng=rng, n_workers=n_workers)
+    
+    def fit_gumbel_left_trend(self, loc_trend='linear', scale_trend=True, n_knots=4):
+        """
+        Fit a Gumbel_L whose parameters trend with the year.
+        
+        fit_gumbel_left() assumes every year is an IID draw, but winning
+        times drift downward. Here loc is linear (or a cubic spline) in the
+        year and log(scale) is linear in the year.
+        
+        Parameters
+        ----------
+        loc_trend : str
+            'constant', 'linear' or 'spline'
+        scale_trend : bool
+            Whether log(scale) trends linearly with the year
+        n_knots : int
+            Interior knots for a spline location trend
+        
+        Returns
+        -------
+        NonStationaryGumbel
+            The fitted model; call .confidence_intervals() for
+            profile-likelihood intervals and .location(years) for the trend.
+        """
+        best = self.yearly_best_vectorized()
+        model = NonStationaryGumbel(best.index.to_numpy(), best.values, fit_type='left',
+                                    loc_trend=loc_trend, scale_trend=scale_trend,
+                                    n_knots=n_knots)
+        return model.fit()
+    
     def plot_histogram_with_fit(self, ax=None, time_units='hours'):
         """
         Plot histogram of yearly best times with Gumbel_L fit.
@@ -191,8 +299,13 @@ class MarathonData:
         print("=" * 60)
 
 
-def main():
-    """Main analysis routine for marathon data."""
+def main(cache=False):
+    """
+    Main analysis routine for marathon data.
+    
+    With cache=True, the CSV is converted once into a Parquet dataset under
+    results/marathon_cache/ (see MarathonStore) and later runs read from it.
+    """
     
     print("=" * 70)
     print("Extreme Value Analysis: NYC Marathon Winning Times")
@@ -205,7 +318,7 @@ def main():
     
     # Analyze Men's division
     try:
-        marathon_men = MarathonData(csv_path, division='Men')
+        marathon_men = MarathonData(csv_path, division='Men', cache=cache)
     except FileNotFoundError:
         print(f"\nError: Could not find {csv_path}")
         print("Make sure you're running this script from the sec06_am215/ directory")
@@ -222,11 +335,22 @@ def main():
     print(f"  Fitted parameters (hours):   loc={loc_m/3600:.3f}, scale={scale_m/3600:.3f}")
     print()
     
+    # Years are not IID: allow loc and scale to trend with the year
+    print("Fitting Gumbel_L with a linear trend in the year...")
+    trend_m = marathon_men.fit_gumbel_left_trend()
+    aic_iid = 4.0 - 2.0 * np.sum(stats.gumbel_l.logpdf(marathon_men.yearly_best.values,
+                                                        loc=loc_m, scale=scale_m))
+    print(f"  AIC: trend={trend_m.aic():.1f}, IID={aic_iid:.1f} (lower is better)")
+    print("  Trend coefficients are per decade:")
+    for name, (est, lo, hi) in trend_m.confidence_intervals().items():
+        print(f"  {name:<16s} {est:10.3f}  95% CI [{lo:10.3f}, {hi:10.3f}]")
+    print()
+    
     # Optional: Also analyze Women's division
     print("-" * 70)
     print("\nOptional: Analyzing Women's division for comparison...\n")
     
-    marathon_women = MarathonData(csv_path, division='Women')
+    marathon_women = MarathonData(csv_path, division='Women', cache=cache)
     print()
     marathon_women.summary_statistics()
     print()
@@ -269,5 +393,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
-
+    parser = argparse.ArgumentParser(description="Extreme value analysis of NYC Marathon winning times.")
+    parser.add_argument('--cache', action='store_true',
+                        help="cache the parsed CSV as Parquet under results/marathon_cache/")
+    main(cache=parser.parse_args().cache)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Columnar (Parquet) cache for marathon results files.
+
+Parsing a large results CSV is slow and MarathonData used to redo it for
+every division. MarathonStore converts the CSV once into a Parquet dataset
+partitioned by division, with `time_seconds` already computed. Later loads
+read only the partition and columns they need, and year ranges are pushed
+down to the Parquet reader as filters.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+import pandas as pd
+from time_parsing import parse_times
+
+
+def _remove(path):
+    """Remove a file or directory tree, if it exists."""
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def file_sha256(path, block_size=2**20):
+    """SHA-256 of a file's contents, read in blocks."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class MarathonStore:
+    """
+    Parquet cache of one marathon results CSV.
+
+    The cache is valid while the CSV's modification time and size match
+    those recorded at build time. If they differ, the CSV is re-hashed: an
+    unchanged hash (e.g. after a `touch`) just refreshes the recorded mtime,
+    a changed hash rebuilds the cache.
+
+    Parameters
+    ----------
+    csv_path : str
+        Path to the results CSV (needs 'year' and 'time' columns)
+    cache_dir : str, optional
+        Where to keep the Parquet dataset (default:
+        results/marathon_cache/<csv file name>)
+    """
+
+    MANIFEST = 'manifest.json'
+    DATASET = 'data.parquet'
+
+    def __init__(self, csv_path, cache_dir=None):
+        self.csv_path = csv_path
+        if cache_dir is None:
+            name = os.path.splitext(os.path.basename(csv_path))[0]
+            cache_dir = os.path.join('results', 'marathon_cache', name)
+        self.cache_dir = cache_dir
+
+    @property
+    def dataset_path(self):
+        return os.path.join(self.cache_dir, self.DATASET)
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.cache_dir, self.MANIFEST)
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_manifest(self, manifest):
+        tmp = self.manifest_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, self.manifest_path)
+
+    def is_valid(self):
+        """Check the cache against the CSV's mtime, size and hash."""
+        manifest = self._read_manifest()
+        # Without a division column the dataset is a single file, not a directory
+        if manifest is None or not os.path.exists(self.dataset_path):
+            return False
+
+        st = os.stat(self.csv_path)
+        if st.st_mtime_ns == manifest['mtime_ns'] and st.st_size == manifest['size']:
+            return True
+        if st.st_size != manifest['size'] or file_sha256(self.csv_path) != manifest['sha256']:
+            return False
+
+        # Same contents, new mtime: remember it so the next check is cheap
+        manifest['mtime_ns'] = st.st_mtime_ns
+        self._write_manifest(manifest)
+        return True
+
+    def build(self):
+        """Parse the CSV and write the partitioned Parquet dataset."""
+        st = os.stat(self.csv_path)
+        df = pd.read_csv(self.csv_path, dtype={'time': str})
+        for col in ['year', 'time']:
+            if col not in df.columns:
+                raise ValueError(f"CSV must contain '{col}' column")
+        df['time_seconds'] = parse_times(df['time'])
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = self.dataset_path + '.tmp'
+        _remove(tmp)
+        partition_cols = ['division'] if 'division' in df.columns else None
+        df.to_parquet(tmp, partition_cols=partition_cols, index=False)
+        _remove(self.dataset_path)
+        os.replace(tmp, self.dataset_path)
+
+        self._write_manifest({
+            'csv_path': os.path.abspath(self.csv_path),
+            'mtime_ns': st.st_mtime_ns,
+            'size': st.st_size,
+            'sha256': file_sha256(self.csv_path),
+            'rows': len(df),
+            'columns': list(df.columns),
+        })
+        print(f"Built Parquet cache for {self.csv_path} ({len(df)} rows) in {self.cache_dir}")
+
+    def load(self, division=None, columns=None, years=None):
+        """
+        Read (part of) the dataset, rebuilding the cache first if stale.
+
+        Parameters
+        ----------
+        division : str, optional
+            Only read this division's partition
+        columns : list of str, optional
+            Only read these columns ('time_seconds' is added if 'time' is
+            requested; columns the CSV does not have are skipped)
+        years : (int, int), optional
+            Inclusive (first, last) year range, applied as a Parquet filter
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        if not self.is_valid():
+            self.build()
+
+        filters = []
+        if division is not None:
+            filters.append(('division', '==', division))
+        if years is not None:
+            filters.append(('year', '>=', years[0]))
+            filters.append(('year', '<=', years[1]))
+
+        if columns is not None:
+            available = self._read_manifest()['columns']
+            columns = [col for col in columns if col in available]
+            if 'time' in columns and 'time_seconds' not in columns:
+                columns.append('time_seconds')
+
+        return pd.read_parquet(self.dataset_path, columns=columns,
+                               filters=filters or None)
+
+    def __repr__(self):
+        return f"MarathonStore(csv_path='{self.csv_path}', cache_dir='{self.cache_dir}')"
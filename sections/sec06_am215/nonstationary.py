@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Non-stationary Gumbel fits with a trend in time.
+
+A plain Gumbel fit treats every block (year) as an IID draw, but marathon
+winning times drift downward over the decades. Here the location depends
+on the year, either linearly or through a cubic B-spline, and the log of
+the scale is linear in the year:
+
+    loc(t)       = X_loc(t) @ beta
+    log scale(t) = gamma_0 + gamma_1 * t
+
+The negative log-likelihood, its gradient and its Hessian are all
+analytic. The fit uses a quasi-Newton optimizer (L-BFGS-B) with the exact
+gradient, and profile-likelihood intervals refit every grid point at once
+with a batched Newton solver.
+"""
+
+import numpy as np
+from scipy import optimize, stats
+from scipy.interpolate import BSpline
+from bootstrap import fit_gumbel_batch
+
+
+def trend_design(t, loc_trend='linear', n_knots=4, knots=None):
+    """
+    Design matrix for the location trend.
+
+    Parameters
+    ----------
+    t : array-like, shape (n,)
+        Standardized time (e.g. decades since the mean year)
+    loc_trend : str
+        'constant', 'linear' ([1, t]) or 'spline' (cubic B-spline basis)
+    n_knots : int
+        Number of interior knots for the spline, at quantiles of t
+    knots : ndarray, optional
+        Full spline knot vector to reuse (e.g. to evaluate a fit at new t)
+
+    Returns
+    -------
+    X : ndarray, shape (n, p)
+    knots : ndarray or None
+        The spline knot vector (None unless loc_trend == 'spline')
+    """
+    t = np.asarray(t, dtype=float)
+    if loc_trend == 'constant':
+        return np.ones((len(t), 1)), None
+    if loc_trend == 'linear':
+        return np.column_stack([np.ones_like(t), t]), None
+    if loc_trend != 'spline':
+        raise ValueError("loc_trend must be 'constant', 'linear' or 'spline'")
+
+    k = 3
+    if knots is None:
+        interior = np.quantile(t, np.linspace(0, 1, n_knots + 2)[1:-1])
+        knots = np.concatenate([[t.min()] * (k + 1), interior, [t.max()] * (k + 1)])
+    # The basis sums to one, so it already contains the intercept
+    X = BSpline.design_matrix(np.clip(t, knots[0], knots[-1]), knots, k).toarray()
+    return X, knots
+
+
+def gumbel_trend_nll(theta, y, X_loc, X_scale, hessian=False):
+    """
+    Gumbel_L negative log-likelihood for many parameter vectors at once.
+
+    With z = (y - loc) / scale, each observation contributes
+    log(scale) - z + exp(z).
+
+    Parameters
+    ----------
+    theta : ndarray, shape (G, p + q)
+        Rows of [beta (location coefficients), gamma (log-scale coefficients)]
+    y : ndarray, shape (n,)
+        Observed block minima
+    X_loc : ndarray, shape (n, p)
+    X_scale : ndarray, shape (n, q)
+    hessian : bool
+        Also return the Hessian
+
+    Returns
+    -------
+    nll : ndarray, shape (G,)
+    grad : ndarray, shape (G, p + q)
+    hess : ndarray, shape (G, p + q, p + q), only if hessian=True
+    """
+    p = X_loc.shape[1]
+    loc = theta[:, :p] @ X_loc.T
+    log_scale = theta[:, p:] @ X_scale.T
+    inv_scale = np.exp(-log_scale)
+    z = (y - loc) * inv_scale
+    a = np.exp(z)
+
+    nll = np.sum(log_scale - z + a, axis=1)
+    d_loc = (1.0 - a) * inv_scale
+    d_log_scale = 1.0 + z * (1.0 - a)
+    grad = np.hstack([d_loc @ X_loc, d_log_scale @ X_scale])
+    if not hessian:
+        return nll, grad
+
+    h_ll = a * inv_scale**2
+    h_ls = (a * (1.0 + z) - 1.0) * inv_scale
+    h_ss = z * (a - 1.0) + z**2 * a
+    H_ll = np.einsum('gn,ni,nj->gij', h_ll, X_loc, X_loc)
+    H_ls = np.einsum('gn,ni,nj->gij', h_ls, X_loc, X_scale)
+    H_ss = np.einsum('gn,ni,nj->gij', h_ss, X_scale, X_scale)
+    hess = np.concatenate([np.concatenate([H_ll, H_ls], axis=2),
+                           np.concatenate([H_ls.transpose(0, 2, 1), H_ss], axis=2)], axis=1)
+    return nll, grad, hess
+
+
+def newton_batch(theta, y, X_loc, X_scale, free=None, max_iter=100, tol=1e-8):
+    """
+    Minimize the negative log-likelihood from many starting points at once.
+
+    Damped (Levenberg) Newton steps with the analytic Hessian are taken for
+    every row together; a row's damping grows when a step does not lower
+    its likelihood and shrinks when it does.
+
+    Parameters
+    ----------
+    theta : ndarray, shape (G, p + q)
+        Starting parameters, one row per problem
+    free : ndarray of bool, shape (p + q,), optional
+        Which parameters to optimize; the others stay at their starting
+        values (used for profile likelihoods)
+
+    Returns
+    -------
+    theta : ndarray, shape (G, p + q)
+    nll : ndarray, shape (G,)
+    """
+    theta = np.array(theta, dtype=float)
+    k = theta.shape[1]
+    free = np.ones(k, dtype=bool) if free is None else np.asarray(free)
+    eye = np.eye(free.sum())
+    damping = np.full(len(theta), 1e-6)
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        nll, grad, hess = gumbel_trend_nll(theta, y, X_loc, X_scale, hessian=True)
+        for _ in range(max_iter):
+            g = grad[:, free]
+            if np.all(np.abs(g) < tol * np.maximum(1.0, np.abs(nll))[:, None]):
+                break
+            H = hess[:, free][:, :, free] + damping[:, None, None] * eye
+            step = np.linalg.solve(H, g[..., None])[..., 0]
+
+            trial = theta.copy()
+            trial[:, free] -= step
+            t_nll, t_grad, t_hess = gumbel_trend_nll(trial, y, X_loc, X_scale, hessian=True)
+            better = t_nll <= nll  # NaN (overflow) counts as worse
+
+            theta[better] = trial[better]
+            nll[better] = t_nll[better]
+            grad[better] = t_grad[better]
+            hess[better] = t_hess[better]
+            damping = np.where(better, damping * 0.1, damping * 10.0)
+    return theta, nll
+
+
+class NonStationaryGumbel:
+    """
+    Gumbel fit to block extremes whose location and scale trend in time.
+
+    Time is standardized to decades since the mean year, so coefficients
+    read as "change per decade".
+
+    Parameters
+    ----------
+    years : array-like, shape (n,)
+        Year of each block
+    values : array-like, shape (n,)
+        Block extreme for each year (e.g. best time in seconds)
+    fit_type : str
+        'left' (gumbel_l, for minima) or 'right' (gumbel_r, for maxima)
+    loc_trend : str
+        'constant', 'linear' or 'spline' trend in the location
+    scale_trend : bool
+        If True, log(scale) is linear in time; otherwise it is constant
+    n_knots : int
+        Interior knots for a spline location trend
+    """
+
+    def __init__(self, years, values, fit_type='left', loc_trend='linear',
+                 scale_trend=True, n_knots=4):
+        if fit_type not in ('left', 'right'):
+            raise ValueError("fit_type must be 'right' or 'left'")
+        self.years = np.asarray(years, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+        self.fit_type = fit_type
+        self.loc_trend = loc_trend
+        self.scale_trend = scale_trend
+        self.n_knots = n_knots
+
+        # A Gumbel_R for x is a Gumbel_L for -x with the location negated
+        self._sign = 1.0 if fit_type == 'left' else -1.0
+        self._y = self._sign * self.values
+        self.year_center = self.years.mean()
+        t = self._time(self.years)
+        self.X_loc, self.knots = trend_design(t, loc_trend, n_knots)
+        self.X_scale = self._scale_design(t)
+
+        p, q = self.X_loc.shape[1], self.X_scale.shape[1]
+        self.names = ([f'loc_{i}' for i in range(p)] if loc_trend == 'spline'
+                      else ['loc', 'loc_trend'][:p])
+        self.names += ['log_scale', 'log_scale_trend'][:q]
+
+        self.params = None  # Will be computed by fit()
+        self.nll = None
+
+    def _time(self, years):
+        """Decades since the mean year."""
+        return (np.asarray(years, dtype=float) - self.year_center) / 10.0
+
+    def _scale_design(self, t):
+        if self.scale_trend:
+            return np.column_stack([np.ones_like(t), t])
+        return np.ones((len(t), 1))
+
+    def _start(self):
+        """Stationary Gumbel fit, spread over the trend coefficients."""
+        loc, scale = fit_gumbel_batch(self._y, fit_type='left')
+        beta = np.linalg.lstsq(self.X_loc, np.full(len(self._y), loc), rcond=None)[0]
+        gamma = np.zeros(self.X_scale.shape[1])
+        gamma[0] = np.log(scale)
+        return np.concatenate([beta, gamma])
+
+    def _objective(self, theta):
+        nll, grad = gumbel_trend_nll(theta[None, :], self._y, self.X_loc, self.X_scale)
+        return nll[0], grad[0]
+
+    def fit(self, tol=1e-10):
+        """
+        Maximum-likelihood fit with L-BFGS-B and the analytic gradient.
+
+        Returns
+        -------
+        self
+        """
+        with np.errstate(over='ignore', invalid='ignore'):
+            result = optimize.minimize(self._objective, self._start(), jac=True,
+                                       method='L-BFGS-B', options={'ftol': tol, 'gtol': 1e-8})
+        self.params = result.x
+        self.nll = result.fun
+        self.result = result
+        return self
+
+    def _require_fit(self):
+        if self.params is None:
+            self.fit()
+
+    def hessian(self):
+        """Observed information matrix at the MLE."""
+        self._require_fit()
+        return gumbel_trend_nll(self.params[None, :], self._y, self.X_loc,
+                                self.X_scale, hessian=True)[2][0]
+
+    def standard_errors(self):
+        """Wald standard errors from the inverse observed information."""
+        return np.sqrt(np.diag(np.linalg.inv(self.hessian())))
+
+    def location(self, years):
+        """Fitted location (in the data's units) for the given years."""
+        self._require_fit()
+        X, _ = trend_design(self._time(years), self.loc_trend, self.n_knots, self.knots)
+        return self._sign * (X @ self.params[:X.shape[1]])
+
+    def scale(self, years):
+        """Fitted scale for the given years."""
+        self._require_fit()
+        X = self._scale_design(self._time(years))
+        return np.exp(X @ self.params[self.X_loc.shape[1]:])
+
+    def aic(self):
+        self._require_fit()
+        return 2.0 * self.nll + 2.0 * len(self.params)
+
+    def profile_likelihood(self, param, values):
+        """
+        Profile negative log-likelihood of one parameter over a grid.
+
+        The other parameters are re-optimized at every grid value, all
+        grid values at once, warm-started from the MLE.
+
+        Parameters
+        ----------
+        param : str or int
+            Parameter name (see self.names) or index
+        values : array-like, shape (G,)
+            Values of the parameter (on the internal, minima scale)
+
+        Returns
+        -------
+        ndarray, shape (G,)
+        """
+        self._require_fit()
+        j = self.names.index(param) if isinstance(param, str) else param
+        values = np.asarray(values, dtype=float)
+        theta = np.tile(self.params, (len(values), 1))
+        theta[:, j] = values
+        free = np.ones(len(self.params), dtype=bool)
+        free[j] = False
+        _, nll = newton_batch(theta, self._y, self.X_loc, self.X_scale, free=free)
+        return nll
+
+    def profile_interval(self, param, alpha=0.05, n_grid=81, width=5.0):
+        """
+        Profile-likelihood confidence interval for one parameter.
+
+        The interval is the set of values whose profile deviance
+        2 (nll_profile - nll_min) stays below the chi-squared(1) quantile,
+        with the crossings found by linear interpolation on the grid.
+
+        Parameters
+        ----------
+        param : str or int
+            Parameter name (see self.names) or index
+        alpha : float
+            Two-sided significance level
+        n_grid : int
+            Number of grid points
+        width : float
+            The grid spans the MLE +/- width standard errors
+
+        Returns
+        -------
+        estimate, lower, upper : float
+            In the data's units (location parameters are sign-corrected
+            for Gumbel_R fits)
+        """
+        self._require_fit()
+        j = self.names.index(param) if isinstance(param, str) else param
+        est = self.params[j]
+        se = self.standard_errors()[j]
+        grid = est + se * np.linspace(-width, width, n_grid)
+        deviance = 2.0 * (self.profile_likelihood(j, grid) - self.nll)
+        cutoff = stats.chi2.ppf(1 - alpha, df=1)
+
+        mid = n_grid // 2
+        left, right = deviance[:mid + 1][::-1], deviance[mid:]
+        bounds = []
+        for side, g in [(left, grid[:mid + 1][::-1]), (right, grid[mid:])]:
+            above = np.nonzero(side > cutoff)[0]
+            if len(above) == 0:
+                bounds.append(np.nan)  # Interval extends past the grid
+                continue
+            i = above[0]
+            bounds.append(np.interp(cutoff, [side[i - 1], side[i]], [g[i - 1], g[i]]))
+        lower, upper = bounds
+
+        if j < self.X_loc.shape[1] and self._sign < 0:
+            return -est, -upper, -lower
+        return est, lower, upper
+
+    def confidence_intervals(self, alpha=0.05):
+        """
+        Profile-likelihood intervals for every parameter, keyed by name.
+
+        Returns
+        -------
+        dict
+            Maps parameter name to (estimate, lower, upper).
+        """
+        return {name: self.profile_interval(j, alpha) for j, name in enumerate(self.names)}
+
+    def __repr__(self):
+        return (f"NonStationaryGumbel(n={len(self.values)}, type='{self.fit_type}', "
+                f"loc_trend='{self.loc_trend}', scale_trend={self.scale_trend})")
+
+
+def main():
+    """Fit a trending Gumbel_L to simulated yearly minima."""
+    print("=" * 70)
+    print("Non-stationary Gumbel_L Fit with a Linear Trend")
+    print("=" * 70)
+
+    rng = np.random.default_rng(42)
+    years = np.arange(1970, 2021)
+    true_loc = 7800.0 - 60.0 * (years - years.mean()) / 10.0
+    true_scale = 150.0 * np.exp(-0.1 * (years - years.mean()) / 10.0)
+    times = stats.gumbel_l.rvs(loc=true_loc, scale=true_scale, random_state=rng)
+
+    model = NonStationaryGumbel(years, times, loc_trend='linear').fit()
+    stationary = NonStationaryGumbel(years, times, loc_trend='constant',
+                                     scale_trend=False).fit()
+    print(f"\n{model}: converged={model.result.success} in {model.result.nit} iterations")
+    print(f"AIC: trend={model.aic():.1f}, stationary={stationary.aic():.1f}")
+    lr = 2.0 * (stationary.nll - model.nll)
+    print(f"Likelihood-ratio test vs stationary: LR={lr:.2f}, "
+          f"p={stats.chi2.sf(lr, df=2):.2g}")
+
+    print("\n95% profile-likelihood intervals (per decade):")
+    for name, (est, lo, hi) in model.confidence_intervals().items():
+        print(f"  {name:<18s} {est:10.4f}  [{lo:10.4f}, {hi:10.4f}]")
+    print("  (true: loc=7800, loc_trend=-60, log_scale=5.0106, log_scale_trend=-0.1)")
+
+
+if __name__ == "__main__":
+    main()
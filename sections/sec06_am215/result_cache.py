@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Persistent, content-addressed cache for EVD maxima.
+
+Sweeping over N is expensive for large N, and most of a sweep is identical
+from one run to the next. This module stores each (distribution, N,
+n_trials, seed, dtype, chunk_size) result on disk under a hash of those
+inputs, so a re-run only computes the sample sizes it has not seen before.
+"""
+
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+
+class MaximaCache:
+    """
+    On-disk cache of maxima arrays keyed by the inputs that produced them.
+
+    Each entry is a compressed ``.npz`` file named by the SHA-256 of
+    ``repr(distribution)``, N, n_trials, seed, dtype and chunk_size. When
+    the total size exceeds `max_bytes`, the least recently used entries
+    are removed.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory that holds the cache files (created if missing)
+    max_bytes : int
+        Upper bound on the total size of the cache on disk
+    """
+
+    SUFFIX = '.npz'
+
+    def __init__(self, cache_dir='results/evd_cache', max_bytes=512 * 2**20):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(distribution, N, n_trials, seed, dtype=np.float64, chunk_size=None):
+        """
+        Hash the inputs of a run into a hex digest.
+
+        chunk_size is part of the key because the chunked path consumes the
+        random stream differently for some samplers (e.g. StudentT draws its
+        gammas per chunk), so the same seed gives different maxima.
+        """
+        text = (f"{distribution!r}|N={int(N)}|n_trials={int(n_trials)}|seed={seed!r}"
+                f"|dtype={np.dtype(dtype).name}|chunk_size={chunk_size!r}")
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + self.SUFFIX)
+
+    def _entries(self):
+        """List (path, size, last access) for every cache file."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(self.SUFFIX):
+                path = os.path.join(self.cache_dir, name)
+                st = os.stat(path)
+                entries.append((path, st.st_size, st.st_mtime))
+        return entries
+
+    def get(self, key):
+        """
+        Look up a cached maxima array.
+
+        Returns
+        -------
+        ndarray or None
+            The cached maxima, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with np.load(path) as f:
+                maxima = f['maxima']
+        except (FileNotFoundError, OSError, KeyError, ValueError):
+            return None
+        # Touch the file so eviction sees it as recently used
+        os.utime(path)
+        return maxima
+
+    def put(self, key, maxima):
+        """Store a maxima array, then evict old entries if over budget."""
+        # Write to a temporary file first so readers never see partial data
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, maxima=np.asarray(maxima))
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            os.remove(tmp)
+            raise
+        self._evict()
+
+    def get_or_compute(self, distribution, N, n_trials, seed, compute, dtype=np.float64,
+                       chunk_size=None):
+        """
+        Return cached maxima for these inputs, computing them on a miss.
+
+        Parameters
+        ----------
+        distribution : BaseDistribution
+            Base distribution (only its repr enters the key)
+        N, n_trials, seed : int
+            Remaining inputs of the run
+        compute : callable
+            Zero-argument function returning the maxima on a cache miss
+        dtype : np.float64 or np.float32
+            Sample precision of the run
+        chunk_size : int or None
+            Trials per chunk of a chunked run (None for the plain path)
+        """
+        key = self.key(distribution, N, n_trials, seed, dtype, chunk_size)
+        maxima = self.get(key)
+        if maxima is None:
+            maxima = compute()
+            self.put(key, maxima)
+        return maxima
+
+    def _evict(self):
+        """Remove least recently used entries until under max_bytes."""
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    @property
+    def size_bytes(self):
+        """Total size of all cache entries on disk."""
+        return sum(size for _, size, _ in self._entries())
+
+    def clear(self):
+        """Remove every cache entry."""
+        for path, _, _ in self._entries():
+            os.remove(path)
+
+    def __len__(self):
+        return len(self._entries())
+
+    def __repr__(self):
+        return (f"MaximaCache(cache_dir='{self.cache_dir}', entries={len(self)}, "
+                f"size={self.size_bytes / 2**20:.1f} MiB)")